@@ -1,5 +1,7 @@
 # Configuration for Twitter Poetry Bot
 
+import os
+
 # Bot Settings
 BOT_SETTINGS = {
     'posts_per_day': 10,
@@ -7,9 +9,79 @@ BOT_SETTINGS = {
     'avoid_repeat_sources': False,  # Allow repeat sources for 10 posts/day
     'avoid_repeat_authors': False,  # Allow repeat authors for 10 posts/day
     'upload_media_v1_1': False,
+    'random_seed': os.getenv('POETRYBOT_RANDOM_SEED'),  # Fix journal/poem shuffling for reproducible runs
+    'speculative_extraction': True,  # Fetch and validate candidate poems concurrently
+    'candidates_per_journal': 5,  # Poem URLs tried per journal before moving on
+    'journal_health_file': 'poetrydata/journal_health.json',  # Backoff records for journals that produced nothing
+    'journal_backoff_base_hours': 1,  # First skip period after a journal yields no poem URLs
+    'journal_backoff_max_hours': 72,  # Backoff doubles per failure up to this cap
     'post_times_utc': ['06:00', '08:00', '10:00', '12:00', '14:00', '16:00', '18:00', '20:00', '22:00', '00:00']
 }
 
+# HTTP transport settings shared by every fetch path (see http_client.py)
+HTTP_SETTINGS = {
+    'pool_connections': 16,  # Number of per-host connection pools to keep
+    'pool_maxsize': 4,  # Keep-alive connections kept open per host
+    'cache_dir': 'poetrydata/http_cache',  # Conditional-GET cache for index and poem pages
+    'rate_per_host': 1.0,  # Requests per second to any one host (SITE_CONFIGS 'rate_limit' overrides)
+    'burst_per_host': 1,  # Requests to one host that may be sent back to back
+    'reachability_file': 'poetrydata/reachability.json',  # Last known status of every fetched URL
+    'reachability_ttl': 6 * 60 * 60,  # Seconds a known status is trusted before re-checking
+    'max_bytes': {  # Largest body accepted per request type; bigger downloads are aborted
+        'index': 8 * 1024 * 1024,
+        'poem': 3 * 1024 * 1024,
+        'page': 5 * 1024 * 1024
+    },
+    'download_deadline': 30,  # Seconds allowed for a whole body download
+    'chunk_size': 64 * 1024,  # Bytes read per streamed chunk
+    'max_retries': 2,  # Extra attempts after a timeout, connection error or retryable status
+    'retry_statuses': [429, 500, 502, 503, 504],
+    'retry_backoff_base': 0.5,  # Seconds; full-jitter exponential backoff between attempts
+    'retry_backoff_cap': 8,  # Longest wait between attempts, including Retry-After
+    'run_budget_seconds': 240,  # Retries never start once a run has used this much time
+    'adaptive_timeouts': True,  # Size each host's timeouts from its observed p99 latency
+    'latency_file': 'poetrydata/latency.json',  # Rolling per-host latency samples
+    'latency_window': 50,  # Samples kept per host
+    'latency_min_samples': 5,  # Fixed timeouts are used until a host has this many samples
+    'timeout_margin_seconds': 2.0,  # Added on top of the p99 latency
+    'timeout_floor_seconds': 2.0,  # Adaptive timeouts never go below this
+    'hedged_requests': False,  # Opt-in: duplicate slow poem-page GETs after the host's p95 latency
+    'hedge_kinds': ['poem'],  # Request types eligible for hedging
+    'hedge_percentile': 95,  # Latency percentile after which a duplicate request is sent
+    'hedge_max_ratio': 0.05,  # Hedges per host never exceed this share of its requests
+    'hedge_window': 200,  # Recent requests per host, kept across runs, that the hedge ratio is measured over
+    # Record/replay fixtures for offline runs: 'off', 'record' or 'replay'
+    'cassette_mode': os.getenv('POETRYBOT_CASSETTE_MODE', 'off'),
+    'cassette_dir': os.getenv('POETRYBOT_CASSETTE_DIR', 'fixtures/cassettes'),
+    'cassette_latency': float(os.getenv('POETRYBOT_CASSETTE_LATENCY', '0')),  # Simulated seconds per replayed request
+    'default_headers': {
+        'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0; +https://github.com/poetrybot)',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+    }
+}
+
+# HTML parsing settings (see html_parsing.py)
+PARSER_SETTINGS = {
+    'backend': 'lxml',  # BeautifulSoup tree builder used for every parse
+    'fallback_backend': 'html.parser',  # Used when the preferred backend is not installed
+    'anchor_only_discovery': True,  # Index pages only build <a> elements (plus selector containers)
+    'streaming_discovery': True,  # Stop downloading index pages once max_links links are found
+    'strip_unused_blocks': True,  # Drop comments, scripts (except JSON-LD), styles and SVG before parsing
+    'selector_profiles': True,  # Try each domain's past winning title/author/poem selectors first
+    'selector_profile_file': 'poetrydata/selector_profiles.json',  # Learned per-domain selector win counts
+    'selector_promotion_share': 0.8,  # Share of a field's wins a selector needs before it is tried first
+    'selector_promotion_min_wins': 3,  # Wins a selector needs before it is tried first
+    'validation_mode': 'region',  # 'region': score the main-content region with early exit; 'full': whole page text
+    'sandbox': False,  # Parse poem and index pages in worker processes with the limits below
+    'sandbox_workers': 2,  # Worker processes
+    'sandbox_tasks_per_worker': 50,  # Documents parsed before a worker is replaced
+    'sandbox_cpu_seconds': 10,  # CPU-time budget per parse
+    'sandbox_memory_mb': 1024,  # Address-space ceiling per worker (RLIMIT_AS)
+    'sandbox_timeout': 20,  # Wall-clock seconds before a parse is abandoned
+}
+
 # Weighted journal list for poem selection
 def get_weighted_journal_list():
     """Return a weighted list of literary journals for poem selection"""
@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 
 def debug_poetry_daily():
     """Debug Poetry Daily page structure"""
@@ -9,7 +9,7 @@ def debug_poetry_daily():
     
     print(f"Status: {response.status_code}")
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = make_soup(response.content)
     print(f"Title: {soup.title.text if soup.title else 'No title'}")
     
     # Look for different content containers
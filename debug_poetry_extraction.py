@@ -3,8 +3,8 @@
 Debug script to test poem extraction and validation
 """
 
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parsing import make_soup
 import re
 from urllib.parse import urlparse
 from poem_link_discovery import get_poem_links, SITE_CONFIGS
@@ -207,8 +207,7 @@ def debug_poem_extraction(url, source_name="Test"):
     print("=" * 80)
     
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_get(url, timeout=15)
         
         print(f"📡 HTTP Status: {response.status_code}")
         
@@ -216,7 +215,7 @@ def debug_poem_extraction(url, source_name="Test"):
             print(f"❌ HTTP {response.status_code} for {url}")
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Debug: Show page title
         page_title = soup.find('title')
@@ -4,14 +4,14 @@ Script to examine Poetry Daily HTML structure
 """
 
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 
 def examine_poetry_daily():
     """Examine the structure of Poetry Daily"""
     url = 'https://poems.com/todays-poem/'
     
     response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = make_soup(response.content)
     
     print(f"Examining: {url}")
     print(f"Status: {response.status_code}")
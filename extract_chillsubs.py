@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 import time
 
@@ -20,7 +20,7 @@ def extract_chillsubs_magazines():
                 print(f"Failed to load page {page}: {response.status_code}")
                 continue
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Look for magazine cards/listings with various selectors
             magazine_elements = (
@@ -4,14 +4,14 @@ Find author structure in Poetry Daily
 """
 
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 
 def find_author_structure():
     """Find where the author information is located"""
     url = 'https://poems.com/todays-poem/'
     
     response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = make_soup(response.content)
     
     print(f"Examining: {url}")
     
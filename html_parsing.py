@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+HTML parsing helpers shared by the bot, discovery and the scraper scripts
+Picks the configured BeautifulSoup tree builder, falling back when it is not installed
+"""
+
+import json
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+from config import PARSER_SETTINGS
+
+
+def _available_backend() -> str:
+    backend = PARSER_SETTINGS.get('backend', 'lxml')
+    fallback = PARSER_SETTINGS.get('fallback_backend', 'html.parser')
+    try:
+        BeautifulSoup('', backend)
+        return backend
+    except FeatureNotFound:
+        print(f"⚠️  Parser backend '{backend}' is not installed, using '{fallback}'")
+        return fallback
+
+
+PARSER_BACKEND = _available_backend()
+
+
+# Blocks the bot never reads: comments, scripts, styles and inline SVG.
+# JSON-LD scripts are kept because extraction reads structured metadata from them.
+# A self-closing start tag (<svg .../>) has no block to remove, so it is skipped
+_UNUSED_BLOCK = r'<!--.*?-->|<(script|style|svg)\b([^>]*?)(?<!/)>.*?</\1\s*>'
+_UNUSED_BLOCK_BYTES = re.compile(_UNUSED_BLOCK.encode('ascii'), re.IGNORECASE | re.DOTALL)
+_UNUSED_BLOCK_TEXT = re.compile(_UNUSED_BLOCK, re.IGNORECASE | re.DOTALL)
+
+
+def _drop_block(match):
+    attributes = match.group(2)
+    marker = b'ld+json' if isinstance(match.string, bytes) else 'ld+json'
+    if attributes and marker in attributes.lower():
+        return match.group(0)
+    return match.string[:0]
+
+
+def strip_unused_blocks(markup):
+    """
+    Remove comments, <script>, <style> and <svg> blocks from raw HTML
+
+    Works on the undecoded bytes, so the parser never sees these blocks.
+    application/ld+json scripts are kept. Self-closing tags and unterminated
+    blocks are left alone.
+
+    Args:
+        markup: HTML as bytes or str
+
+    Returns:
+        The markup without those blocks, of the same type
+    """
+    if isinstance(markup, bytes):
+        return _UNUSED_BLOCK_BYTES.sub(_drop_block, markup)
+    if isinstance(markup, str):
+        return _UNUSED_BLOCK_TEXT.sub(_drop_block, markup)
+    return markup
+
+
+# Selectors that can be answered from anchors alone: a bare anchor with attribute
+# filters ('a[href*="/poem/"]'), optionally under one container ('div.archive a')
+_ANCHOR_SELECTOR = re.compile(
+    r'^\s*(?:(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)\s+)?a(?P<filters>(?:\[[^\]]*\])*)\s*$'
+)
+_ATTRIBUTE_FILTER = re.compile(
+    r'\[\s*(?P<name>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<bare>[^\]\s]+))\s*)?\]'
+)
+
+# Elements that never have an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+
+class AnchorSelector:
+    """A '[container ]a[attr op value]...' CSS selector evaluated without building a tree"""
+
+    def __init__(self, container_tag: Optional[str], container_classes: Set[str], filters: List[Tuple]):
+        self.container_tag = container_tag
+        self.container_classes = container_classes
+        self.filters = filters
+
+    @property
+    def has_container(self) -> bool:
+        return bool(self.container_tag or self.container_classes)
+
+    def is_container(self, name: str, attrs: Dict) -> bool:
+        """Check whether an element is a container this selector looks inside"""
+        if not self.has_container:
+            return False
+        if self.container_tag and name != self.container_tag:
+            return False
+        classes = (attrs.get('class') or '').split()
+        return self.container_classes.issubset(classes)
+
+    def matches_anchor(self, attrs: Dict) -> bool:
+        """Check an anchor's attributes against the selector's attribute filters"""
+        for name, op, value in self.filters:
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and (not value or value not in actual):
+                return False
+            if op == '^=' and (not value or not actual.startswith(value)):
+                return False
+            if op == '$=' and (not value or not actual.endswith(value)):
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+            if op == '|=' and actual != value and not actual.startswith(value + '-'):
+                return False
+        return True
+
+
+def parse_anchor_selector(selector: str) -> Optional[AnchorSelector]:
+    """
+    Parse a CSS selector that only depends on an anchor and one optional container
+
+    Args:
+        selector: CSS selector from a site configuration
+
+    Returns:
+        An AnchorSelector, or None if the selector needs a full tree
+    """
+    match = _ANCHOR_SELECTOR.match(selector)
+    if not match:
+        return None
+
+    filters = []
+    remaining = match.group('filters')
+    for attribute in _ATTRIBUTE_FILTER.finditer(match.group('filters')):
+        value = next((v for v in attribute.group('dq', 'sq', 'bare') if v is not None), None)
+        filters.append((attribute.group('name').lower(), attribute.group('op'), value))
+        remaining = remaining.replace(attribute.group(0), '', 1)
+    if remaining.strip():
+        return None
+
+    classes = set(filter(None, (match.group('classes') or '').split('.')))
+    tag = match.group('tag').lower() if match.group('tag') else None
+    return AnchorSelector(tag, classes, filters)
+
+
+class AnchorStreamParser(HTMLParser):
+    """
+    Incremental parser that reports anchors as soon as they close
+
+    Feed it decoded text as it arrives and collect anchors with
+    pop_anchors(). Each anchor is (href, text, matched_selector) where
+    matched_selector tells whether any of the given selectors matches it.
+    """
+
+    def __init__(self, selectors: List[AnchorSelector]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.stack = []
+        self.container_depth = [0] * len(selectors)
+        self.current = None
+        self.anchors = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        if tag == 'a':
+            self._close_anchor()
+            matched = any(
+                selector.matches_anchor(attrs) and (not selector.has_container or self.container_depth[i] > 0)
+                for i, selector in enumerate(self.selectors)
+            )
+            self.current = (attrs.get('href'), [], matched)
+        if tag in VOID_ELEMENTS:
+            return
+        indices = [i for i, selector in enumerate(self.selectors) if selector.is_container(tag, attrs)]
+        for i in indices:
+            self.container_depth[i] += 1
+        self.stack.append((tag, indices))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == 'a':
+            self._close_anchor()
+        # Close the nearest open element with this name and anything left open inside it
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                for _, indices in self.stack[position:]:
+                    for i in indices:
+                        self.container_depth[i] -= 1
+                del self.stack[position:]
+                break
+
+    def handle_data(self, data):
+        if self.current is not None:
+            self.current[1].append(data)
+
+    def _close_anchor(self):
+        if self.current is not None:
+            href, text, matched = self.current
+            self.anchors.append((href, ''.join(text), matched))
+            self.current = None
+
+    def close(self):
+        super().close()
+        self._close_anchor()
+
+    def pop_anchors(self) -> List[Tuple[Optional[str], str, bool]]:
+        """Return the anchors completed since the last call"""
+        anchors, self.anchors = self.anchors, []
+        return anchors
+
+
+@lru_cache(maxsize=None)
+def _compile_selectors(selectors: Tuple[str, ...]) -> Tuple[soupsieve.SoupSieve, ...]:
+    compiled = []
+    for selector in selectors:
+        try:
+            compiled.append(soupsieve.compile(selector))
+        except Exception as e:
+            print(f"⚠️  CSS selector '{selector}' failed: {e}")
+    return tuple(compiled)
+
+
+def compile_selectors(selectors: Iterable[str]) -> Tuple[soupsieve.SoupSieve, ...]:
+    """
+    Compile CSS selectors once per process
+
+    Args:
+        selectors: CSS selectors in priority order
+
+    Returns:
+        Compiled selectors in the same order; invalid selectors are reported and skipped
+    """
+    return _compile_selectors(tuple(selectors))
+
+
+def select_first(soup, selectors: Iterable[soupsieve.SoupSieve]):
+    """
+    Run compiled selectors in order and yield the first match of each
+
+    Args:
+        soup: Parsed document or tag to search
+        selectors: Compiled selectors in priority order
+
+    Returns:
+        Iterator of (selector, element) pairs, skipping selectors that match
+        nothing
+    """
+    for selector in selectors:
+        element = selector.select_one(soup)
+        if element is not None:
+            yield selector, element
+
+
+def make_soup(markup, parser: Optional[str] = None, parse_only: Optional[SoupStrainer] = None,
+              prune: bool = False, encoding: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse HTML with the configured backend
+
+    Args:
+        markup: HTML as bytes or str
+        parser: Tree builder to use instead of the configured one
+        parse_only: Strainer limiting which elements are built
+        prune: Strip comments, scripts, styles and SVG before parsing
+            (when PARSER_SETTINGS['strip_unused_blocks'] is on)
+        encoding: Known encoding of byte markup; skips charset detection
+            unless decoding with it fails
+
+    Returns:
+        The parsed BeautifulSoup document
+    """
+    if prune and PARSER_SETTINGS.get('strip_unused_blocks', True):
+        markup = strip_unused_blocks(markup)
+    if not isinstance(markup, bytes):
+        encoding = None
+    return BeautifulSoup(markup, parser or PARSER_BACKEND, parse_only=parse_only, from_encoding=encoding)
+
+
+def anchor_strainer(css_selectors: List[str]) -> Optional[SoupStrainer]:
+    """
+    Build a strainer that only materializes anchors and the containers the selectors need
+
+    Every <a> element is kept. For container selectors such as 'article a' or
+    'div.archive a', matching containers are kept with all their descendants
+    so the selector still matches the same anchors as on a full tree.
+
+    Args:
+        css_selectors: CSS selectors that will be run on the parsed page
+
+    Returns:
+        A SoupStrainer, or None if a selector needs the full tree
+    """
+    containers = []
+    for selector in css_selectors:
+        parsed = parse_anchor_selector(selector)
+        if parsed is None:
+            return None
+        if parsed.has_container:
+            containers.append(parsed)
+
+    def keep(name, attrs):
+        return name == 'a' or any(container.is_container(name, attrs) for container in containers)
+
+    return SoupStrainer(keep)
+
+
+# JSON-LD types that describe the page's main work, most specific first
+_WORK_TYPES = ['Article', 'BlogPosting', 'NewsArticle', 'CreativeWork', 'WebPage']
+_SITE_TYPES = ['WebSite', 'Organization']
+
+
+def _json_ld_items(data) -> Iterable[Dict]:
+    """Flatten JSON-LD into its typed objects, following lists and @graph"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_items(item)
+    elif isinstance(data, dict):
+        if '@type' in data:
+            yield data
+        if '@graph' in data:
+            yield from _json_ld_items(data['@graph'])
+
+
+def _json_ld_types(item: Dict) -> List[str]:
+    types = item.get('@type')
+    return types if isinstance(types, list) else [types]
+
+
+def _person_names(value) -> List[str]:
+    if isinstance(value, list):
+        return [name for entry in value for name in _person_names(entry)]
+    if isinstance(value, dict):
+        value = value.get('name')
+    return [value.strip()] if isinstance(value, str) and value.strip() else []
+
+
+def _meta_content(head, **attrs) -> Optional[str]:
+    tag = head.find('meta', attrs=attrs)
+    content = tag.get('content', '').strip() if tag else ''
+    return content or None
+
+
+def read_page_metadata(soup) -> Dict[str, List[str]]:
+    """
+    Collect title, author and site name candidates from structured metadata
+
+    Reads JSON-LD scripts, OpenGraph tags and <meta name="author"> without
+    walking the page body. Candidates are returned as published; callers
+    decide which are plausible.
+
+    Args:
+        soup: Parsed page
+
+    Returns:
+        Dict with 'titles', 'authors' and 'site_names' lists, best candidates first
+    """
+    head = soup.head or soup
+    items = []
+    for script in soup.find_all('script', attrs={'type': re.compile('ld\\+json', re.IGNORECASE)}):
+        try:
+            items.extend(_json_ld_items(json.loads(script.string or '')))
+        except ValueError:
+            continue
+
+    titles, authors, site_names = [], [], []
+    for work_type in _WORK_TYPES:
+        for item in items:
+            if work_type in _json_ld_types(item):
+                for key in ('headline', 'name'):
+                    if isinstance(item.get(key), str) and item[key].strip():
+                        titles.append(item[key].strip())
+                authors.extend(_person_names(item.get('author')))
+    for item in items:
+        if any(site_type in _json_ld_types(item) for site_type in _SITE_TYPES):
+            site_names.extend(_person_names(item))
+
+    og_title = _meta_content(head, property='og:title')
+    if og_title:
+        titles.append(og_title)
+    meta_author = _meta_content(head, name='author')
+    if meta_author:
+        authors.append(meta_author)
+    site_name = _meta_content(head, property='og:site_name')
+    if site_name:
+        site_names.insert(0, site_name)
+
+    return {'titles': titles, 'authors': authors, 'site_names': site_names}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+On-disk conditional-GET cache for fetched pages
+Stores response bodies with their ETag / Last-Modified validators so later
+runs can revalidate with If-None-Match / If-Modified-Since and serve 304s from disk
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers worth keeping alongside the cached body
+STORED_HEADERS = ['ETag', 'Last-Modified', 'Content-Type']
+
+
+class HttpCache:
+    """Conditional-GET cache keyed by URL, one metadata + body file pair per entry"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def load(self, url: str) -> Optional[Dict]:
+        """
+        Load the cached entry for a URL
+
+        Args:
+            url: URL to look up
+
+        Returns:
+            Metadata dict with a 'body' key, or None if nothing usable is cached
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url:
+            return None
+        return entry
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict:
+        """
+        Build the revalidation headers for a cached entry
+
+        Args:
+            entry: Entry returned by load()
+
+        Returns:
+            Dict with If-None-Match / If-Modified-Since (empty if nothing to send)
+        """
+        headers = {}
+        if not entry:
+            return headers
+        stored = entry.get('headers', {})
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def store(self, url: str, response: requests.Response):
+        """
+        Store a 200 response if it carries a validator
+
+        Args:
+            url: URL the response was fetched for
+            response: The fresh response
+        """
+        if response.status_code != 200:
+            return
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+
+        entry = {
+            'url': url,
+            'headers': headers,
+            'stored_at': time.time()
+        }
+        meta_path, body_path = self._paths(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to temp files first so a concurrent reader never sees half an entry
+            with open(body_path + '.tmp', 'wb') as f:
+                f.write(response.content)
+            with open(meta_path + '.tmp', 'w') as f:
+                json.dump(entry, f)
+            os.replace(body_path + '.tmp', body_path)
+            os.replace(meta_path + '.tmp', meta_path)
+        except OSError as e:
+            print(f"⚠️  Could not cache {url}: {e}")
+
+    def to_response(self, url: str, entry: Dict, revalidated: requests.Response) -> requests.Response:
+        """
+        Turn a cached entry into a 200 response after a 304 revalidation
+
+        Args:
+            url: URL that was requested
+            entry: Entry returned by load()
+            revalidated: The 304 response from the server
+
+        Returns:
+            A requests.Response carrying the cached body
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        # Fresh validators from the 304 win over the stored ones
+        for name in ('ETag', 'Last-Modified'):
+            if name in revalidated.headers:
+                response.headers[name] = revalidated.headers[name]
+        response._content = entry['body']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = revalidated.request
+        response.elapsed = revalidated.elapsed
+        response.from_cache = True
+        return response
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Record/replay HTTP cassettes for offline, deterministic runs
+In record mode every real response is saved as a fixture; in replay mode the
+fixtures are served byte-for-byte instead of touching the network
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterator, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_MODES = ('off', 'record', 'replay')
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Replay mode was asked for a request that was never recorded"""
+
+
+class Cassette:
+    """Directory of recorded responses, one metadata + body file pair per request"""
+
+    def __init__(self, directory: str, mode: str = 'off', latency: float = 0.0):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}' (expected one of {', '.join(CASSETTE_MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    def _paths(self, method: str, url: str):
+        key = hashlib.sha1(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def record(self, method: str, url: str, response: requests.Response):
+        """
+        Save a real response as a fixture
+
+        Args:
+            method: HTTP method ('GET' or 'HEAD')
+            url: URL that was requested
+            response: Response with its body already read
+        """
+        meta_path, body_path = self._paths(method, url)
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'final_url': response.url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'elapsed': response.elapsed.total_seconds() if response.elapsed else 0.0
+        }
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(body_path, 'wb') as f:
+                f.write(response.content or b'')
+            with open(meta_path, 'w') as f:
+                json.dump(entry, f, indent=2)
+
+    def entries(self) -> Iterator[Tuple[Dict, bytes]]:
+        """
+        Iterate over every recorded response
+
+        Returns:
+            Iterator of (metadata, body) pairs, in file name order
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            try:
+                with open(meta_path, 'r') as f:
+                    entry = json.load(f)
+                with open(meta_path[:-len('.json')] + '.body', 'rb') as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                continue
+            yield entry, body
+
+    def replay(self, method: str, url: str) -> requests.Response:
+        """
+        Serve a recorded response
+
+        Args:
+            method: HTTP method ('GET' or 'HEAD')
+            url: URL being requested
+
+        Returns:
+            A requests.Response rebuilt from the fixture
+
+        Raises:
+            CassetteMiss: If the request was never recorded
+        """
+        meta_path, body_path = self._paths(method, url)
+        try:
+            with open(meta_path, 'r') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            raise CassetteMiss(f"No recorded {method.upper()} response for {url}")
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry.get('final_url') or url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        # The recorded body is already decoded, so drop transfer encodings
+        response.headers.pop('Content-Encoding', None)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=self.latency)
+        response.reason = 'Replayed'
+        response.from_cache = False
+        return response
@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP transport for the Poetry Bot
+Every page fetch and HEAD check goes through one pooled keep-alive session
+"""
+
+import atexit
+import codecs
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import HTTP_SETTINGS
+from http_cache import HttpCache
+from http_cassette import Cassette
+from latency_tracker import LatencyTracker
+from reachability import ReachabilityCache
+from request_scheduler import RequestScheduler
+
+_session = None
+_session_lock = threading.Lock()
+
+_cache = HttpCache(HTTP_SETTINGS.get('cache_dir', 'poetrydata/http_cache'))
+
+_reachability = ReachabilityCache(
+    HTTP_SETTINGS.get('reachability_file', 'poetrydata/reachability.json'),
+    HTTP_SETTINGS.get('reachability_ttl', 6 * 60 * 60)
+)
+atexit.register(_reachability.save)
+
+_latency = LatencyTracker(
+    HTTP_SETTINGS.get('latency_file', 'poetrydata/latency.json'),
+    window=HTTP_SETTINGS.get('latency_window', 50),
+    min_samples=HTTP_SETTINGS.get('latency_min_samples', 5),
+    hedge_window=HTTP_SETTINGS.get('hedge_window', 200)
+)
+atexit.register(_latency.save)
+
+_scheduler = RequestScheduler(
+    rate=HTTP_SETTINGS.get('rate_per_host', 1.0),
+    burst=HTTP_SETTINGS.get('burst_per_host', 1)
+)
+
+_cassette = Cassette(
+    HTTP_SETTINGS.get('cassette_dir', 'fixtures/cassettes'),
+    mode=HTTP_SETTINGS.get('cassette_mode', 'off'),
+    latency=HTTP_SETTINGS.get('cassette_latency', 0.0)
+)
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hedge')
+
+# Monotonic time after which no retry may start (None until a run budget is set)
+_run_deadline = None
+
+# Backoff jitter has its own generator so retries never consume numbers from
+# the global one, which a seeded run uses to pick journals and poems
+_jitter = random.Random()
+
+# Downloads aborted for size or time, kept for the run summary
+_aborted_downloads = []
+_aborted_lock = threading.Lock()
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Body exceeded the byte limit for its request type"""
+
+
+class DownloadDeadlineExceeded(requests.Timeout):
+    """Body download took longer than the overall deadline"""
+
+
+# charset parameter of a Content-Type header, and a <meta charset> / http-equiv declaration
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# Labels browsers decode as windows-1252, which is a superset of them
+_WINDOWS_1252_LABELS = {'iso-8859-1', 'iso8859-1', 'latin-1', 'latin1', 'l1', 'us-ascii', 'ascii'}
+
+_BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16le'),
+    (codecs.BOM_UTF16_BE, 'utf-16be')
+]
+
+
+def _encoding_label(label: str) -> Optional[str]:
+    label = label.strip().lower()
+    if label in _WINDOWS_1252_LABELS:
+        return 'windows-1252'
+    try:
+        codecs.lookup(label)
+    except LookupError:
+        return None
+    return label
+
+
+def detect_encoding(body: bytes, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Work out a body's encoding without statistical detection
+
+    Checks, in browser order, a byte order mark, the Content-Type charset and
+    a <meta> charset declaration in the first 1 KB.
+
+    Args:
+        body: Raw response body (or its first chunk)
+        content_type: Value of the Content-Type header, if any
+
+    Returns:
+        Encoding name, or None if full detection is needed
+    """
+    for mark, encoding in _BYTE_ORDER_MARKS:
+        if body.startswith(mark):
+            return encoding
+
+    if content_type:
+        match = _HEADER_CHARSET.search(content_type)
+        if match and _encoding_label(match.group(1)):
+            return _encoding_label(match.group(1))
+
+    match = _META_CHARSET.search(body[:1024])
+    if match:
+        encoding = _encoding_label(match.group(1).decode('ascii'))
+        # A document readable as ASCII cannot really be UTF-16
+        if encoding and encoding.startswith('utf-16'):
+            return 'utf-8'
+        return encoding
+    return None
+
+
+def response_encoding(response: requests.Response) -> Optional[str]:
+    """
+    Work out a fetched page's encoding from its headers or first kilobyte
+
+    Args:
+        response: Response whose body has been read
+
+    Returns:
+        Encoding name, or None if full detection is needed
+    """
+    return detect_encoding(response.content or b'', response.headers.get('Content-Type'))
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide pooled session, creating it on first use
+
+    Returns:
+        A requests.Session with keep-alive pools and the default headers
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_SETTINGS.get('pool_connections', 16),
+                    pool_maxsize=HTTP_SETTINGS.get('pool_maxsize', 4)
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(HTTP_SETTINGS.get('default_headers', {}))
+                _session = session
+    return _session
+
+
+def close_session():
+    """Close the pooled session and drop its open connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def set_host_rate_limit(host: str, rate: float, burst: Optional[int] = None):
+    """
+    Override the politeness rate for one host
+
+    Args:
+        host: Host or domain name (a leading 'www.' is ignored)
+        rate: Requests per second allowed to the host
+        burst: Requests that may be sent back to back
+    """
+    _scheduler.set_rate(host, rate, burst)
+
+
+def start_run_budget(seconds: Optional[float] = None):
+    """
+    Start the per-run time budget that bounds retries
+
+    Args:
+        seconds: Budget length (defaults to HTTP_SETTINGS['run_budget_seconds'])
+    """
+    global _run_deadline
+    if seconds is None:
+        seconds = HTTP_SETTINGS.get('run_budget_seconds', 240)
+    _run_deadline = time.monotonic() + seconds
+
+
+def remaining_run_budget() -> Optional[float]:
+    """Return the seconds left in the run budget, or None if no budget is set"""
+    if _run_deadline is None:
+        return None
+    return max(0.0, _run_deadline - time.monotonic())
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value.strip())
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _with_retries(send: Callable[[float], requests.Response], url: str, timeout: float) -> requests.Response:
+    """
+    Call send(timeout) with jittered exponential backoff on transient failures
+
+    Timeouts, connection errors and retryable statuses are retried up to
+    HTTP_SETTINGS['max_retries'] times. A Retry-After header sets the wait.
+    No retry starts if its wait would run past the run budget, and retried
+    requests never get a timeout longer than the budget that is left.
+
+    Args:
+        send: Function performing one attempt with the given timeout
+        url: URL being requested (for reporting)
+        timeout: Timeout of the first attempt in seconds
+
+    Returns:
+        The last response received
+    """
+    max_retries = HTTP_SETTINGS.get('max_retries', 2)
+    retry_statuses = HTTP_SETTINGS.get('retry_statuses', [429, 500, 502, 503, 504])
+    base = HTTP_SETTINGS.get('retry_backoff_base', 0.5)
+    cap = HTTP_SETTINGS.get('retry_backoff_cap', 8)
+
+    attempt = 0
+    while True:
+        try:
+            response = send(timeout)
+            if response.status_code not in retry_statuses or attempt >= max_retries:
+                return response
+            delay = _retry_after_seconds(response)
+            failure = f"HTTP {response.status_code}"
+        except (ResponseTooLarge, DownloadDeadlineExceeded):
+            raise
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if attempt >= max_retries:
+                raise
+            response = None
+            delay = None
+            failure = type(e).__name__
+
+        if delay is None:
+            delay = _jitter.uniform(0, min(cap, base * (2 ** attempt)))
+
+        remaining = remaining_run_budget()
+        if delay > cap or (remaining is not None and delay >= remaining):
+            print(f"⚠️  Not retrying {url} after {failure}: wait of {delay:.1f}s does not fit the budget")
+            if response is not None:
+                return response
+            raise requests.Timeout(f"Retry budget exhausted for {url} after {failure}")
+
+        if response is not None:
+            response.close()
+        print(f"🔁 Retrying {url} in {delay:.1f}s after {failure}")
+        time.sleep(delay)
+        attempt += 1
+
+        remaining = remaining_run_budget()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining, 0.1))
+
+
+def get_aborted_downloads() -> List[Dict]:
+    """Return the downloads aborted so far for exceeding their size or time limit"""
+    with _aborted_lock:
+        return list(_aborted_downloads)
+
+
+def print_aborted_downloads():
+    """Report the downloads aborted so far, for the end-of-run summary"""
+    aborted = get_aborted_downloads()
+    if not aborted:
+        return
+    print(f"\n✂️  Aborted downloads this run: {len(aborted)}")
+    for download in aborted:
+        print(f"   {download['kind']}: {download['url']} ({download['reason']})")
+
+
+def _abort_download(response: requests.Response, url: str, kind: str, reason: str):
+    response.close()
+    with _aborted_lock:
+        _aborted_downloads.append({'url': url, 'kind': kind, 'reason': reason})
+    print(f"⚠️  Aborted download of {url}: {reason}")
+
+
+def _iter_capped(response: requests.Response, url: str, kind: str) -> Iterator[bytes]:
+    """
+    Yield a streamed response body chunk by chunk, enforcing the size cap and deadline
+
+    Args:
+        response: Response opened with stream=True
+        url: URL being fetched (for reporting)
+        kind: Request type used to pick the byte limit ('index', 'poem' or 'page')
+    """
+    limits = HTTP_SETTINGS.get('max_bytes', {})
+    max_bytes = limits.get(kind, limits.get('page', 5 * 1024 * 1024))
+    deadline = time.monotonic() + HTTP_SETTINGS.get('download_deadline', 30)
+
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        reason = f"declared size {declared} bytes exceeds {kind} limit of {max_bytes}"
+        _abort_download(response, url, kind, reason)
+        raise ResponseTooLarge(reason, response=response)
+
+    received = 0
+    for chunk in response.iter_content(chunk_size=HTTP_SETTINGS.get('chunk_size', 64 * 1024)):
+        received += len(chunk)
+        if received > max_bytes:
+            reason = f"body exceeds {kind} limit of {max_bytes} bytes"
+            _abort_download(response, url, kind, reason)
+            raise ResponseTooLarge(reason, response=response)
+        if time.monotonic() > deadline:
+            reason = f"download exceeded {HTTP_SETTINGS.get('download_deadline', 30)}s deadline"
+            _abort_download(response, url, kind, reason)
+            raise DownloadDeadlineExceeded(reason, response=response)
+        yield chunk
+
+
+def _read_body(response: requests.Response, url: str, kind: str):
+    """
+    Stream a response body into memory, enforcing the size cap and deadline
+
+    Args:
+        response: Response opened with stream=True
+        url: URL being fetched (for reporting)
+        kind: Request type used to pick the byte limit ('index', 'poem' or 'page')
+    """
+    response._content = b''.join(_iter_capped(response, url, kind))
+    response._content_consumed = True
+    response.close()
+
+
+def _slices(body: bytes) -> Iterator[bytes]:
+    chunk_size = HTTP_SETTINGS.get('chunk_size', 64 * 1024)
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+def _send(method: str, url: str, timeout_cap: float, sent: Optional[threading.Event] = None,
+          **kwargs) -> requests.Response:
+    """
+    Send one request through the scheduler with adaptive timeouts
+
+    The host's timeouts come from its p99 latency plus a margin, never more
+    than timeout_cap. The time to headers (or the expired timeout) is fed
+    back into the host's latency histogram.
+
+    Args:
+        method: HTTP method
+        url: URL to request
+        timeout_cap: The caller's fixed timeout, used as the upper bound
+        sent: Event set once the scheduler lets the request go out
+        **kwargs: Passed through to Session.request
+
+    Returns:
+        The requests.Response
+    """
+    host = urlparse(url).netloc
+    if HTTP_SETTINGS.get('adaptive_timeouts', True):
+        timeout = _latency.timeouts_for(
+            host, timeout_cap,
+            margin=HTTP_SETTINGS.get('timeout_margin_seconds', 2.0),
+            floor=HTTP_SETTINGS.get('timeout_floor_seconds', 2.0)
+        )
+    else:
+        timeout = (timeout_cap, timeout_cap)
+
+    _scheduler.acquire(url)
+    if sent is not None:
+        sent.set()
+    try:
+        response = get_session().request(method, url, timeout=timeout, **kwargs)
+    except requests.ConnectTimeout:
+        _latency.observe(host, timeout[0])
+        raise
+    except requests.Timeout:
+        _latency.observe(host, timeout[1])
+        raise
+    _latency.observe(host, response.elapsed.total_seconds())
+    return response
+
+
+def _hedged(attempt: Callable[[Optional[threading.Event]], requests.Response],
+            url: str, kind: str) -> requests.Response:
+    """
+    Run attempt(), sending a duplicate if it is slower than the host's p95
+
+    Only used when hedged_requests is enabled and the request type is listed
+    in hedge_kinds. The p95 clock starts once the scheduler has let the
+    request out, so time spent waiting for a rate-limit token never triggers
+    a hedge. Whichever copy finishes first wins; if it failed, the other
+    copy's outcome is used.
+
+    Args:
+        attempt: Function performing one complete request; it sets the event
+            it is given once the request is sent
+        url: URL being requested
+        kind: Request type ('index', 'poem' or 'page')
+
+    Returns:
+        The first successful response
+    """
+    host = urlparse(url).netloc
+    _latency.count_request(host)
+    if not HTTP_SETTINGS.get('hedged_requests', False) or kind not in HTTP_SETTINGS.get('hedge_kinds', ['poem']):
+        return attempt(None)
+
+    hedge_after = _latency.percentile(host, HTTP_SETTINGS.get('hedge_percentile', 95))
+    if hedge_after is None:
+        return attempt(None)
+
+    sent = threading.Event()
+
+    def primary_attempt():
+        try:
+            return attempt(sent)
+        finally:
+            sent.set()
+
+    primary = _hedge_executor.submit(primary_attempt)
+    sent.wait()
+    done, _ = wait([primary], timeout=hedge_after)
+    if done or not _latency.take_hedge(host, HTTP_SETTINGS.get('hedge_max_ratio', 0.05)):
+        return primary.result()
+
+    print(f"🪃 Hedging {url} after {hedge_after:.2f}s")
+    pending = {primary, _hedge_executor.submit(attempt, None)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+    raise error
+
+
+def _get_from_network(url: str, timeout: float, headers: Optional[Dict],
+                      use_cache: bool, kind: str) -> requests.Response:
+    entry = _cache.load(url) if use_cache else None
+    request_headers = dict(headers or {})
+    request_headers.update(_cache.conditional_headers(entry))
+
+    def send(attempt_timeout):
+        def attempt(sent):
+            response = _send('GET', url, attempt_timeout, sent=sent, headers=request_headers, stream=True)
+            _read_body(response, url, kind)
+            return response
+        return _hedged(attempt, url, kind)
+
+    response = _with_retries(send, url, timeout)
+    if not use_cache:
+        return response
+
+    if response.status_code == 304 and entry:
+        return _cache.to_response(url, entry, response)
+
+    _cache.store(url, response)
+    response.from_cache = False
+    return response
+
+
+def http_get(url: str, timeout: float = 15, headers: Optional[Dict] = None,
+             use_cache: bool = False, kind: str = 'page') -> requests.Response:
+    """
+    Fetch a URL with GET through the pooled session
+
+    The body is streamed in chunks and the download is aborted if it grows
+    past the byte limit for its request type or runs past the deadline.
+    In cassette replay mode the recorded response is served instead.
+
+    Args:
+        url: URL to fetch
+        timeout: Request timeout in seconds
+        headers: Extra headers merged over the session defaults
+        use_cache: Revalidate against the on-disk cache and serve 304s from it
+        kind: Request type for the byte limit ('index', 'poem' or 'page')
+
+    Returns:
+        The requests.Response (from_cache is True when the body came from disk)
+    """
+    if _cassette.replaying:
+        response = _cassette.replay('GET', url)
+    else:
+        response = _get_from_network(url, timeout, headers, use_cache, kind)
+        if _cassette.recording:
+            _cassette.record('GET', url, response)
+
+    _reachability.record(url, response.status_code)
+    return response
+
+
+def http_stream(url: str, timeout: float = 15, use_cache: bool = False, kind: str = 'page',
+                on_headers: Optional[Callable[[Dict], None]] = None) -> Iterator[bytes]:
+    """
+    Fetch a URL with GET and yield its body as it arrives
+
+    The consumer may stop iterating at any time; the download is then
+    abandoned. A 304 revalidation yields the cached body, and a fresh body is
+    only stored in the cache if it was read to the end. Cassette record and
+    replay modes read the whole body through http_get.
+
+    Args:
+        url: URL to fetch
+        timeout: Request timeout in seconds
+        use_cache: Revalidate against the on-disk cache
+        kind: Request type for the byte limit ('index', 'poem' or 'page')
+        on_headers: Called with the response headers before the first chunk
+
+    Returns:
+        Iterator of body chunks
+
+    Raises:
+        requests.HTTPError: If the final status is not 200
+    """
+    if _cassette.replaying or _cassette.recording:
+        response = http_get(url, timeout=timeout, use_cache=use_cache, kind=kind)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+        if on_headers:
+            on_headers(response.headers)
+        yield from _slices(response.content)
+        return
+
+    entry = _cache.load(url) if use_cache else None
+    request_headers = _cache.conditional_headers(entry)
+
+    def send(attempt_timeout):
+        return _send('GET', url, attempt_timeout, headers=request_headers, stream=True)
+
+    response = _with_retries(send, url, timeout)
+    _reachability.record(url, 200 if response.status_code == 304 and entry else response.status_code)
+
+    if response.status_code == 304 and entry:
+        response.close()
+        if on_headers:
+            on_headers(CaseInsensitiveDict(entry.get('headers', {})))
+        yield from _slices(entry['body'])
+        return
+    if response.status_code != 200:
+        response.close()
+        raise requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+    if on_headers:
+        on_headers(response.headers)
+
+    chunks = []
+    try:
+        for chunk in _iter_capped(response, url, kind):
+            if use_cache:
+                chunks.append(chunk)
+            yield chunk
+    finally:
+        response.close()
+
+    if use_cache:
+        response._content = b''.join(chunks)
+        _cache.store(url, response)
+
+
+def http_head(url: str, timeout: float = 10, headers: Optional[Dict] = None,
+              allow_redirects: bool = False) -> requests.Response:
+    """
+    Check a URL with HEAD through the pooled session
+
+    Args:
+        url: URL to check
+        timeout: Request timeout in seconds
+        headers: Extra headers merged over the session defaults
+        allow_redirects: Follow redirects before returning
+
+    Returns:
+        The requests.Response
+    """
+    if _cassette.replaying:
+        response = _cassette.replay('HEAD', url)
+    else:
+        def send(attempt_timeout):
+            return _send('HEAD', url, attempt_timeout, headers=headers, allow_redirects=allow_redirects)
+
+        response = _with_retries(send, url, timeout)
+        if _cassette.recording:
+            _cassette.record('HEAD', url, response)
+
+    if allow_redirects or not response.is_redirect:
+        _reachability.record(url, response.status_code)
+    return response
+
+
+def check_url_status(url: str, timeout: float = 10, allow_redirects: bool = True) -> int:
+    """
+    Return a URL's HTTP status, trusting any fresh verdict from earlier fetches
+
+    A GET or HEAD made within the reachability TTL counts as proof, so the
+    network is only used when the cached status is missing or stale.
+
+    Args:
+        url: URL to check
+        timeout: HEAD timeout in seconds when a network check is needed
+        allow_redirects: Follow redirects on the HEAD request
+
+    Returns:
+        The HTTP status code
+    """
+    status = _reachability.lookup(url)
+    if status is not None:
+        return status
+    return http_head(url, timeout=timeout, allow_redirects=allow_redirects).status_code
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Per-journal health records with exponential backoff
+A journal whose discovery produced nothing is skipped until its backoff expires,
+so cold runs stop paying for journals that are guaranteed to fail
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict
+
+
+class JournalHealth:
+    """Persisted domain -> failure count / skip-until map"""
+
+    def __init__(self, path: str, base_backoff: float, max_backoff: float):
+        self.path = path
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+        self.records = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        # Called with the lock held
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump(self.records, f, indent=2)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save journal health: {e}")
+
+    def should_skip(self, domain: str) -> bool:
+        """
+        Check whether a journal is still backing off
+
+        Args:
+            domain: Journal domain
+
+        Returns:
+            True if the journal failed recently and its backoff has not expired
+        """
+        with self.lock:
+            record = self.records.get(domain)
+        return bool(record) and time.time() < record['skip_until']
+
+    def seconds_until_retry(self, domain: str) -> float:
+        """Return how long a backing-off journal will still be skipped"""
+        with self.lock:
+            record = self.records.get(domain)
+        if not record:
+            return 0.0
+        return max(0.0, record['skip_until'] - time.time())
+
+    def record_failure(self, domain: str, reason: str = ''):
+        """
+        Record that a journal produced nothing, doubling its backoff
+
+        Args:
+            domain: Journal domain
+            reason: Short description kept for debugging
+        """
+        with self.lock:
+            record = self.records.get(domain, {'failures': 0})
+            failures = record['failures'] + 1
+            backoff = min(self.max_backoff, self.base_backoff * (2 ** (failures - 1)))
+            self.records[domain] = {
+                'failures': failures,
+                'skip_until': time.time() + backoff,
+                'last_reason': reason
+            }
+            self._save()
+
+    def record_success(self, domain: str):
+        """Clear a journal's failure history"""
+        with self.lock:
+            if domain in self.records:
+                del self.records[domain]
+                self._save()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Rolling per-host latency histograms
+Used to size each journal's timeouts from how fast it actually answers, and
+to budget hedged requests against each host's recent request history
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from request_scheduler import normalize_host
+
+
+class LatencyTracker:
+    """Keeps the last `window` response times and `hedge_window` requests per host, persisted as one JSON file"""
+
+    def __init__(self, path: str, window: int = 50, min_samples: int = 5, hedge_window: int = 200):
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge_window = hedge_window
+        self.samples = {}
+        # host -> one flag per recent request, True where the request was a hedge
+        self.requests = {}
+        self.loaded = False
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def _load(self):
+        # Called with the lock held
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if 'latency' not in stored:
+            # Files written before hedge history was kept hold only the samples
+            stored = {'latency': stored}
+        for host, values in stored.get('latency', {}).items():
+            self.samples[host] = deque(values, maxlen=self.window)
+        for host, flags in stored.get('requests', {}).items():
+            self.requests[host] = deque((bool(flag) for flag in flags), maxlen=self.hedge_window)
+
+    def observe(self, host: str, seconds: float):
+        """
+        Record how long a host took to answer
+
+        Args:
+            host: Host that was requested
+            seconds: Time until the response headers arrived (or the timeout that expired)
+        """
+        host = normalize_host(host)
+        with self.lock:
+            self._load()
+            if host not in self.samples:
+                self.samples[host] = deque(maxlen=self.window)
+            self.samples[host].append(round(seconds, 3))
+            self.dirty = True
+
+    def percentile(self, host: str, pct: float) -> Optional[float]:
+        """
+        Return a latency percentile for a host
+
+        Args:
+            host: Host to look up
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None until enough samples were seen
+        """
+        host = normalize_host(host)
+        with self.lock:
+            self._load()
+            values = sorted(self.samples.get(host, ()))
+        if len(values) < self.min_samples:
+            return None
+        index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+        return values[index]
+
+    def count_request(self, host: str):
+        """
+        Record a request to a host in its hedge history
+
+        Args:
+            host: Host that was requested
+        """
+        with self.lock:
+            self._append_request(normalize_host(host), False)
+
+    def take_hedge(self, host: str, max_ratio: float) -> bool:
+        """
+        Reserve a hedged request for a host if its budget allows one
+
+        The budget spans runs: hedges may make up at most max_ratio of the
+        host's last hedge_window requests, the hedge itself included.
+
+        Args:
+            host: Host about to be hedged
+            max_ratio: Largest share of requests that may be hedges
+
+        Returns:
+            True if the hedge was reserved (and recorded as a request)
+        """
+        host = normalize_host(host)
+        with self.lock:
+            self._load()
+            flags = self.requests.get(host, ())
+            if sum(flags) + 1 > max_ratio * (len(flags) + 1):
+                return False
+            self._append_request(host, True)
+            return True
+
+    def _append_request(self, host: str, hedged: bool):
+        # Called with the lock held
+        self._load()
+        if host not in self.requests:
+            self.requests[host] = deque(maxlen=self.hedge_window)
+        self.requests[host].append(hedged)
+        self.dirty = True
+
+    def timeouts_for(self, host: str, cap: float, margin: float, floor: float) -> Tuple[float, float]:
+        """
+        Derive (connect, read) timeouts for a host from its p99 latency
+
+        requests only reports time-to-headers, which bounds the connect time
+        from above, so both timeouts are derived from the same percentile.
+
+        Args:
+            host: Host about to be requested
+            cap: Largest timeout allowed (the caller's fixed timeout)
+            margin: Seconds added on top of the p99
+            floor: Smallest timeout ever used
+
+        Returns:
+            (connect_timeout, read_timeout) in seconds
+        """
+        p99 = self.percentile(host, 99)
+        if p99 is None:
+            return cap, cap
+        timeout = min(cap, max(floor, p99 + margin))
+        return timeout, timeout
+
+    def save(self):
+        """Write the histograms and hedge histories to disk"""
+        with self.lock:
+            if not self.dirty:
+                return
+            stored: Dict = {
+                'latency': {host: list(values) for host, values in self.samples.items()},
+                'requests': {host: [int(flag) for flag in flags] for host, flags in self.requests.items()}
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path + '.tmp', 'w') as f:
+                    json.dump(stored, f)
+                os.replace(self.path + '.tmp', self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save latency histograms: {e}")
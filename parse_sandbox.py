@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Optional sandboxed parsing in worker processes
+A malformed or huge page can keep the HTML parser busy for a long time; in the
+sandbox each parse runs in a recycled worker process with a CPU-time budget,
+an address-space ceiling and a wall-clock timeout, and a parse that blows any
+of them becomes an UNPARSEABLE result instead of stalling the run
+"""
+
+import importlib
+import multiprocessing
+import queue
+import signal
+import threading
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; only the wall-clock timeout applies there
+    resource = None
+
+from config import PARSER_SETTINGS
+from selector_profiles import SELECTOR_PROFILES
+
+# Parse functions the workers may run, by task name. These modules must not
+# import the bot itself, so workers stay free of the Twitter and AI clients
+TASKS = {
+    'poem': ('poem_extraction', 'extract_poem_from_html'),
+    'links': ('poem_link_discovery', 'extract_poem_links')
+}
+
+
+class _Unparseable:
+    """Result of a parse that exceeded its CPU, memory or time budget"""
+
+    def __repr__(self):
+        return 'UNPARSEABLE'
+
+
+UNPARSEABLE = _Unparseable()
+
+
+class ParseBudgetExceeded(Exception):
+    """Raised inside a worker when its CPU-time budget runs out"""
+
+
+def _on_cpu_limit(signum, frame):
+    raise ParseBudgetExceeded("CPU-time budget exceeded")
+
+
+def _init_worker(memory_mb):
+    """Import the parse modules, then cap the worker's address space"""
+    for module_name, _ in TASKS.values():
+        importlib.import_module(module_name)
+    # Hand selector wins back to the parent instead of writing the profile file
+    SELECTOR_PROFILES.collect_only()
+
+    if resource is None:
+        return
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    if memory_mb:
+        limit = int(memory_mb) * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _cpu_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _run_task(task, args, kwargs, cpu_seconds):
+    """
+    Run one parse in the worker under a CPU-time budget
+
+    RLIMIT_CPU counts the whole process, so the soft limit is moved to the
+    time used so far plus the budget before each parse and lifted afterwards.
+
+    Returns:
+        (ok, result or failure reason, selector wins recorded by the parse)
+    """
+    module_name, function_name = TASKS[task]
+    function = getattr(importlib.import_module(module_name), function_name)
+
+    limited = resource is not None and cpu_seconds
+    if limited:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(_cpu_used() + cpu_seconds) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+    try:
+        return True, function(*args, **kwargs), SELECTOR_PROFILES.drain()
+    except ParseBudgetExceeded as e:
+        return False, str(e), []
+    except MemoryError:
+        return False, "memory ceiling exceeded", []
+    except RecursionError:
+        return False, "document nested too deeply", []
+    finally:
+        if limited:
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _worker_main(connection, memory_mb):
+    """Worker process loop: announce readiness, then run tasks until told to stop"""
+    _init_worker(memory_mb)
+    connection.send('ready')
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        try:
+            reply = _run_task(*message)
+        except Exception as e:
+            # Passed back and re-raised in the caller, as a direct call would
+            reply = None, e, []
+        connection.send(reply)
+
+
+class _Worker:
+    """One parse process and the pipe it takes tasks on"""
+
+    def __init__(self, context, memory_mb):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_connection, memory_mb), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+        self.tasks = 0
+
+    def wait_ready(self):
+        """Block until the worker has imported the parse modules (raises EOFError if it died)"""
+        if not self.ready:
+            self.connection.recv()
+            self.ready = True
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.connection.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class _WorkerPool:
+    """
+    Fixed number of parse processes, each handed one task at a time
+
+    Callers wait for an idle worker before their parse is sent, so the
+    wall-clock timeout only covers the parse itself, and a parse that runs
+    past it costs only its own worker.
+    """
+
+    def __init__(self, size: int, tasks_per_worker: int, memory_mb: int):
+        # Workers are started fresh rather than forked from a process with threads
+        self.context = multiprocessing.get_context('spawn')
+        self.tasks_per_worker = tasks_per_worker
+        self.memory_mb = memory_mb
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.workers = set()
+
+    def checkout(self) -> _Worker:
+        """Take an idle worker, starting one if the pool has room"""
+        self.slots.acquire()
+        try:
+            worker = self.idle.get_nowait()
+        except queue.Empty:
+            try:
+                worker = _Worker(self.context, self.memory_mb)
+            except Exception:
+                self.slots.release()
+                raise
+            with self.lock:
+                self.workers.add(worker)
+        return worker
+
+    def checkin(self, worker: _Worker):
+        """Return a worker after a parse, retiring it once it has run its share of tasks"""
+        worker.tasks += 1
+        if self.tasks_per_worker and worker.tasks >= self.tasks_per_worker:
+            self._forget(worker)
+            worker.stop()
+        else:
+            self.idle.put(worker)
+        self.slots.release()
+
+    def discard(self, worker: _Worker):
+        """Kill a stuck or dead worker; the next checkout starts a replacement"""
+        self._forget(worker)
+        worker.kill()
+        self.slots.release()
+
+    def _forget(self, worker: _Worker):
+        with self.lock:
+            self.workers.discard(worker)
+
+    def shutdown(self):
+        """Stop the idle workers and kill any still parsing"""
+        with self.lock:
+            workers, self.workers = self.workers, set()
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.stop()
+                worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.kill()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _WorkerPool:
+    """Create the worker pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _WorkerPool(
+                PARSER_SETTINGS.get('sandbox_workers', 2),
+                PARSER_SETTINGS.get('sandbox_tasks_per_worker', 50),
+                PARSER_SETTINGS.get('sandbox_memory_mb', 1024)
+            )
+        return _pool
+
+
+def shutdown_sandbox():
+    """Stop the worker processes"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def sandboxed_parse(task: str, *args, **kwargs):
+    """
+    Run a parse function in a worker process under the sandbox budgets
+
+    The wall-clock timeout starts when a worker receives the parse, not while
+    the call waits for a free worker.
+
+    Args:
+        task: 'poem' (extract_poem_from_html) or 'links' (extract_poem_links)
+        *args, **kwargs: Arguments for the parse function
+
+    Returns:
+        The function's result, or UNPARSEABLE if the parse ran out of CPU time,
+        memory or wall-clock time, or crashed its worker
+    """
+    pool = _get_pool()
+    timeout = PARSER_SETTINGS.get('sandbox_timeout', 20)
+    cpu_seconds = PARSER_SETTINGS.get('sandbox_cpu_seconds', 10)
+
+    worker = pool.checkout()
+    try:
+        worker.wait_ready()
+        worker.connection.send((task, args, kwargs, cpu_seconds))
+        if not worker.connection.poll(timeout):
+            print(f"⚠️  Parse exceeded {timeout}s, killing its worker")
+            pool.discard(worker)
+            return UNPARSEABLE
+        ok, result, wins = worker.connection.recv()
+    except (EOFError, OSError):
+        print("⚠️  Parse worker died (CPU or memory limit), starting a new one")
+        pool.discard(worker)
+        return UNPARSEABLE
+    except BaseException:
+        pool.discard(worker)
+        raise
+    pool.checkin(worker)
+
+    if ok is None:
+        raise result
+    if not ok:
+        print(f"⚠️  Unparseable document: {result}")
+        return UNPARSEABLE
+    for domain, winners in wins:
+        SELECTOR_PROFILES.record(domain, winners)
+    return result
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Poem extraction from downloaded journal pages
+Kept free of the bot's API clients so parse worker processes can import it
+without loading the Twitter and AI libraries
+"""
+
+import re
+from urllib.parse import urlparse
+
+from config import PARSER_SETTINGS
+from html_parsing import compile_selectors, make_soup, read_page_metadata, select_first
+from selector_profiles import SELECTOR_PROFILES
+
+# Extraction selectors in priority order, compiled once per process
+TITLE_SELECTORS = compile_selectors([
+    'h2',  # Poetry Daily uses h2 for poem titles
+    'h1', 'h2.title', '.poem-title', '.title', 
+    'h1.entry-title', 'h2.entry-title', '.post-title'
+])
+
+AUTHOR_SELECTORS = compile_selectors([
+    '.daily_poem_author',  # Poetry Daily specific
+    '.author', '.poet', '.byline', '.poem-author',
+    'span.author', 'p.author', 'div.author',
+    'a[href*="/poet"]', 'a[href*="/author"]'
+])
+
+POEM_SELECTORS = compile_selectors([
+    '.elementor-widget-theme-post-content',  # Poetry Daily specific
+    '.poem', '.poetry', '.poem-text', '.poem-content', 
+    '.verse', 'pre.poem', '.entry-content', 
+    'main', 'article', '.post-content'
+])
+
+def profiled_selectors(domain, field, selectors):
+    """Return selectors with the domain's dominant past winner first, when profiles are enabled"""
+    if not domain or not PARSER_SETTINGS.get('selector_profiles', True):
+        return selectors
+    return SELECTOR_PROFILES.ordered(domain, field, selectors)
+
+# Titles and author names that are page furniture, not the poem's
+GENERIC_TITLES = ['Featured Poet', 'Featured Translator', 'Receive POETRY DAILY']
+NON_AUTHORS = ['Instagram', 'Facebook', 'Twitter']
+
+# Account names CMSs publish as the author (e.g. 'Site Admin', 'Editorial Staff'),
+# matched as whole words so names like 'William Stafford' are kept
+CMS_ACCOUNT_PATTERN = re.compile(
+    r'\b(?:admin|administrator|webmaster|editors?|editorial|staff|team)\b', re.IGNORECASE
+)
+
+# Separators between a page title and the site name ('Daughter – Poetry Daily')
+TITLE_SITE_SEPARATORS = [' – ', ' — ', ' | ', ' - ', ' :: ', ' · ']
+
+def clean_author_name(candidate):
+    """Strip a leading 'by' and anything after the first comma"""
+    candidate = re.sub(r'^(by\s+)', '', candidate.strip(), flags=re.IGNORECASE)
+    return re.sub(r'(,.*$)', '', candidate)
+
+def is_plausible_author(name, site_names):
+    """Reject empty names, social links, the site's own name and CMS account names"""
+    if not name or name in NON_AUTHORS:
+        return False
+    if name.lower() in [site.lower() for site in site_names]:
+        return False
+    if CMS_ACCOUNT_PATTERN.search(name):
+        return False
+    # Lower-case single words are user names ('jsmith'), not bylines
+    return ' ' in name or name != name.lower()
+
+def clean_metadata_title(candidate, site_names, author=None):
+    """Drop a trailing site name and a trailing 'by <author>' from a metadata title"""
+    candidate = candidate.strip()
+    for site in site_names:
+        for separator in TITLE_SITE_SEPARATORS:
+            if candidate.endswith(separator + site):
+                candidate = candidate[:-len(separator + site)].strip()
+    if author and candidate.lower().endswith(' by ' + author.lower()):
+        candidate = candidate[:-len(' by ' + author)].strip()
+    return candidate
+
+# Substrings that mark a line as navigation, metadata or promotion
+LINE_EXCLUDE_PATTERNS = [
+    'subscribe', 'newsletter', 'archive', 'browse', 'search',
+    'about', 'contact', 'home', 'menu', 'navigation',
+    'read more', 'continue reading', 'full text',
+    'print issues', 'buy now', 'purchase', 'add to cart',
+    'interviews', 'reviews', 'submissions', 'guidelines',
+    'editorial', 'editor', 'staff', 'masthead',
+    'winner', 'finalist', 'contest', 'award',
+    'university', 'college', 'press', 'publisher',
+    'www.', 'http', '.com', '.org'
+]
+
+# One pass over a lower-cased line: a 'by ' byline within the first 10
+# characters, any excluded substring, or a '//' (URLs and comments)
+LINE_REJECT_PATTERN = re.compile(
+    r'^.{0,7}by |' + '|'.join(re.escape(pattern) for pattern in LINE_EXCLUDE_PATTERNS) + r'|//',
+    re.DOTALL
+)
+
+def clean_poem_lines(lines, title, author):
+    """Keep the lines that look like poem text
+    
+    Drops lines that repeat the title or author, open with a byline, contain
+    an excluded pattern or a '//', are 5 characters or shorter, or start with
+    '(' or end with ')'. Lines are expected to be stripped already.
+    """
+    title_lower = title.lower()
+    author_lower = author.lower()
+    clean_lines = []
+    for line in lines:
+        if len(line) <= 5 or line.startswith('(') or line.endswith(')'):
+            continue
+        line_lower = line.lower()
+        if title_lower in line_lower or author_lower in line_lower:
+            continue
+        if LINE_REJECT_PATTERN.search(line_lower):
+            continue
+        clean_lines.append(line)
+    return clean_lines
+
+def extract_poem_from_html(content, url, source_name="Unknown", parser=None, encoding=None):
+    """Extract poem content from an already downloaded poem page
+    
+    The author is settled first: a byline found by the DOM selectors, then
+    structured metadata (JSON-LD, meta author). <meta name="author"> is often
+    the CMS account that posted the poem, so an on-page byline wins over it.
+    The title comes from metadata (JSON-LD, OpenGraph) with a trailing site
+    name and 'by <author>' removed, then from the page title and DOM
+    selectors. Searching the full page text for a byline is the last resort.
+    
+    Returns a dict with title, author, text and source, or None if the page
+    does not yield enough poem text.
+    """
+    soup = make_soup(content, parser=parser, prune=True, encoding=encoding)
+    domain = urlparse(url).netloc
+    winners = {}
+    
+    # Structured metadata - it is in the head and needs no body walk
+    metadata = read_page_metadata(soup)
+    site_names = metadata['site_names'] + ([source_name] if source_name != "Unknown" else [])
+    
+    # Extract author - an on-page byline first
+    author = "Unknown"
+    for selector, author_elem in select_first(soup, profiled_selectors(domain, 'author', AUTHOR_SELECTORS)):
+        # Clean up author name
+        candidate_author = clean_author_name(author_elem.get_text())
+        # Skip non-author text
+        if candidate_author and candidate_author not in NON_AUTHORS:
+            author = candidate_author
+            winners['author'] = selector.pattern
+            break
+    
+    # Then the author named in structured metadata
+    if author == "Unknown":
+        for candidate_author in metadata['authors']:
+            candidate_author = clean_author_name(candidate_author)
+            if is_plausible_author(candidate_author, site_names):
+                author = candidate_author
+                break
+    
+    # Metadata titles often end in the site name or 'by <author>', so they are
+    # cleaned once the author is known
+    title = "Untitled"
+    for candidate_title in metadata['titles']:
+        candidate_title = clean_metadata_title(candidate_title, site_names, author if author != "Unknown" else None)
+        if candidate_title and candidate_title not in GENERIC_TITLES and candidate_title not in site_names:
+            title = candidate_title
+            break
+    
+    # Then try to extract from page title (Poetry Daily specific)
+    page_title_elem = soup.find('title') if title == "Untitled" else None
+    if page_title_elem:
+        page_title = page_title_elem.get_text().strip()
+        if ' – Poetry Daily' in page_title:
+            title = page_title.replace(' – Poetry Daily', '').strip()
+    
+    # If that didn't work, try other selectors
+    if title == "Untitled":
+        for selector, title_elem in select_first(soup, profiled_selectors(domain, 'title', TITLE_SELECTORS)):
+            candidate_title = title_elem.get_text().strip()
+            # Skip generic titles
+            if candidate_title and candidate_title not in GENERIC_TITLES:
+                title = candidate_title
+                winners['title'] = selector.pattern
+                break
+    
+    # Last resort: look for a byline in the full page text (too loose to trim titles with)
+    if author == "Unknown":
+        text_content = soup.get_text()
+        author_match = re.search(r'by\s+([^\n,]+)', text_content, re.IGNORECASE)
+        if author_match:
+            author = author_match.group(1).strip()
+    
+    # Extract poem text - try multiple selectors
+    poem_selector, poem_content = next(select_first(soup, profiled_selectors(domain, 'poem', POEM_SELECTORS)),
+                                       (None, None))
+    
+    if not poem_content:
+        print(f"⚠️  No poem content found at {url}")
+        return None
+    winners['poem'] = poem_selector.pattern
+    
+    # Extract and clean poem text
+    poem_text = poem_content.get_text(separator='\n').strip()
+    lines = [line.strip() for line in poem_text.split('\n') if line.strip()]
+    
+    # Clean up lines - remove navigation, metadata, etc.
+    clean_lines = clean_poem_lines(lines, title, author)
+    
+    # Take first 20 lines of actual poem content
+    poem_text = '\n'.join(clean_lines[:20])
+    
+    if len(poem_text) > 50 and len(clean_lines) >= 3:
+        # Remember which selectors produced an accepted poem on this domain
+        if domain and PARSER_SETTINGS.get('selector_profiles', True):
+            SELECTOR_PROFILES.record(domain, winners)
+        return {
+            'title': title,
+            'author': author,
+            'text': poem_text,
+            'source': source_name
+        }
+    
+    print(f"⚠️  Insufficient poem content after cleaning from {url}")
+    return None
@@ -4,15 +4,25 @@ Poem Link Discovery System
 Discovers actual poem URLs from poetry websites by analyzing link patterns
 """
 
-import requests
-from bs4 import BeautifulSoup
-import re
+import asyncio
+import codecs
+from contextlib import closing
+from itertools import islice
 from urllib.parse import urljoin, urlparse
-import time
-from typing import List, Dict, Set
+from typing import Iterator, List, Dict, Set, Optional
 import json
+from requests.structures import CaseInsensitiveDict
+from http_client import (detect_encoding, http_get, http_stream, print_aborted_downloads, response_encoding,
+                         set_host_rate_limit)
+from html_parsing import (AnchorStreamParser, anchor_strainer, compile_selectors, make_soup,
+                          parse_anchor_selector, select_first)
+from url_classifier import POEM, classifier_for
+from parse_sandbox import UNPARSEABLE, sandboxed_parse
+from config import PARSER_SETTINGS
 
 # Site-specific configurations for poem link discovery
+# An optional 'rate_limit': {'rate': <requests/sec>, 'burst': <n>} overrides
+# the per-host politeness defaults from HTTP_SETTINGS for that site
 SITE_CONFIGS = {
     'poems.com': {
         'name': 'Poetry Daily',
@@ -205,6 +215,122 @@ SITE_CONFIGS = {
     }
 }
 
+# Register per-site politeness overrides with the shared scheduler
+for _domain, _config in SITE_CONFIGS.items():
+    if 'rate_limit' in _config:
+        set_host_rate_limit(_domain, _config['rate_limit']['rate'], _config['rate_limit'].get('burst'))
+
+
+# Link text that suggests a poem
+POEM_TEXT_INDICATORS = [
+    'poem', 'poetry', 'verse', 'sonnet', 'haiku', 'ballad',
+    'elegy', 'ode', 'limerick', 'free verse'
+]
+
+# ENHANCED: Link text that indicates non-poem content
+EXCLUDE_TEXT_INDICATORS = [
+    'review', 'essay', 'interview', 'conversation', 'profile',
+    'announcement', 'news', 'winner', 'prize', 'award', 'wins',
+    'selected poems', 'new and selected', 'building the perfect',
+    'lightness', 'marie howe', 'ruth lilly', 'critical essay',
+    'about', 'biography', 'memoir', 'craft essay', 'poetics'
+]
+
+# URL path terms that rule out a text-indicator match
+EXCLUDE_PATH_TERMS = [
+    'about', 'contact', 'submit', 'subscribe', 'search', 'browse',
+    'review', 'essay', 'interview', 'conversation', 'profile',
+    'announcement', 'news', 'winner', 'prize', 'award', 'wins',
+    'lightness', 'marie-howe', 'ruth-lilly', 'critical-essay',
+    'building-the-perfect', 'new-and-selected'
+]
+
+def _link_rule(absolute_url: str, link_text: str, classifier) -> Optional[str]:
+    """
+    Apply the URL pattern and link-text rules to a single anchor
+    
+    Args:
+        absolute_url: Resolved link URL
+        link_text: Anchor text as it appears on the page
+        classifier: The site's compiled UrlClassifier
+        
+    Returns:
+        'pattern' or 'text' for the rule that accepted the link, or None
+    """
+    path = urlparse(absolute_url).path
+    
+    # Method 2: URL matches a poem pattern and no exclude pattern
+    if classifier.classify_path(path) == POEM:
+        return 'pattern'
+    
+    # Method 3: Look for common poem indicators in link text (ENHANCED)
+    link_text = link_text.lower().strip()
+    if not any(indicator in link_text for indicator in POEM_TEXT_INDICATORS):
+        return None
+    if any(indicator in link_text for indicator in EXCLUDE_TEXT_INDICATORS):
+        return None
+    
+    # Enhanced exclusion check
+    if any(term in path.lower() for term in EXCLUDE_PATH_TERMS):
+        return None
+    return 'text'
+
+def extract_poem_links(content, base_url: str, site_config: Dict, parser: Optional[str] = None,
+                       encoding: Optional[str] = None) -> List[str]:
+    """
+    Find poem URLs in an already downloaded index page
+    
+    Every anchor is visited once: CSS selector membership, URL patterns and
+    link-text indicators are checked together, in that order.
+    
+    Args:
+        content: Page HTML as bytes or str
+        base_url: URL the page was fetched from (for resolving relative links)
+        site_config: Configuration dict with patterns and selectors
+        parser: Tree builder to use instead of the configured one
+        encoding: Encoding of byte content, when already known
+        
+    Returns:
+        Sorted list of discovered poem URLs
+    """
+    discovered_links = set()
+    
+    # Only anchors matter for discovery, so skip building the rest of the page when we can
+    strainer = None
+    if PARSER_SETTINGS.get('anchor_only_discovery', True):
+        strainer = anchor_strainer(site_config.get('css_selectors', []))
+    soup = make_soup(content, parser=parser, parse_only=strainer, prune=True, encoding=encoding)
+    
+    # Method 1: CSS selectors, compiled once per process and matched against each anchor
+    selectors = compile_selectors(site_config.get('css_selectors', []))
+    
+    classifier = classifier_for(site_config)
+    found_by = {'selector': 0, 'pattern': 0, 'text': 0}
+    
+    for link in soup.find_all('a', href=True):
+        href = link.get('href')
+        
+        # Skip empty hrefs
+        if not href:
+            continue
+        
+        # Convert to absolute URL
+        absolute_url = urljoin(base_url, href)
+        
+        if any(selector.match(link) for selector in selectors):
+            rule = 'selector'
+        else:
+            rule = _link_rule(absolute_url, link.get_text(), classifier)
+        
+        if rule:
+            found_by[rule] += 1
+            discovered_links.add(absolute_url)
+    
+    print(f"  📎 {found_by['selector']} CSS selector, 📝 {found_by['pattern']} pattern, "
+          f"📖 {found_by['text']} text indicator matches ({len(discovered_links)} unique)")
+    
+    return sorted(discovered_links)
+
 def get_poem_links(base_url: str, site_config: Dict) -> List[str]:
     """
     Discover actual poem URLs from a poetry website
@@ -216,133 +342,229 @@ def get_poem_links(base_url: str, site_config: Dict) -> List[str]:
     Returns:
         List of discovered poem URLs
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0; +https://github.com/poetrybot)',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
-    
-    discovered_links = set()
+    unique_links = []
     
     try:
         print(f"🔍 Discovering poem links from {base_url}")
         
         # Fetch the page
-        response = requests.get(base_url, headers=headers, timeout=15)
+        response = http_get(base_url, timeout=15, use_cache=True, kind='index')
         if response.status_code != 200:
             print(f"❌ HTTP {response.status_code} for {base_url}")
             return []
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Method 1: Use CSS selectors if provided
-        if 'css_selectors' in site_config:
-            for selector in site_config['css_selectors']:
-                try:
-                    links = soup.select(selector)
-                    for link in links:
-                        href = link.get('href')
-                        if href:
-                            # Convert relative URLs to absolute
-                            absolute_url = urljoin(base_url, href)
-                            discovered_links.add(absolute_url)
-                            print(f"  📎 CSS selector found: {absolute_url}")
-                except Exception as e:
-                    print(f"⚠️  CSS selector '{selector}' failed: {e}")
-        
-        # Method 2: Pattern matching on all links
-        all_links = soup.find_all('a', href=True)
-        
-        for link in all_links:
-            href = link.get('href', '')
-            
-            # Skip empty hrefs
+        if PARSER_SETTINGS.get('sandbox', False):
+            unique_links = sandboxed_parse('links', response.content, base_url, site_config,
+                                           encoding=response_encoding(response))
+            if unique_links is UNPARSEABLE:
+                print(f"⚠️  Skipping unparseable index page {base_url}")
+                unique_links = []
+        else:
+            unique_links = extract_poem_links(response.content, base_url, site_config,
+                                              encoding=response_encoding(response))
+        
+    except Exception as e:
+        print(f"❌ Error discovering links from {base_url}: {e}")
+    
+    print(f"✅ Discovered {len(unique_links)} potential poem links from {base_url}")
+    return unique_links
+
+def iter_poem_links(base_url: str, site_config: Dict) -> Iterator[str]:
+    """
+    Stream an index page and yield poem URLs as soon as their anchors are parsed
+    
+    The page is fed to an incremental parser chunk by chunk, so a consumer
+    that stops early also stops the download. Chunks are decoded with the
+    charset from the Content-Type header or the page's <meta> declaration.
+    Sites whose CSS selectors need a full tree fall back to get_poem_links.
+    
+    Args:
+        base_url: The base URL to start discovery from
+        site_config: Configuration dict with patterns and selectors
+        
+    Returns:
+        Iterator of unique poem URLs in page order
+    """
+    selectors = [parse_anchor_selector(selector) for selector in site_config.get('css_selectors', [])]
+    if any(selector is None for selector in selectors):
+        yield from get_poem_links(base_url, site_config)
+        return
+    
+    print(f"🔍 Streaming poem links from {base_url}")
+    parser = AnchorStreamParser(selectors)
+    classifier = classifier_for(site_config)
+    headers = CaseInsensitiveDict()
+    decoder = None
+    seen = set()
+    
+    def new_links():
+        for href, text, selector_hit in parser.pop_anchors():
             if not href:
                 continue
-            
-            # Convert to absolute URL
             absolute_url = urljoin(base_url, href)
-            parsed_url = urlparse(absolute_url)
-            
-            # Check if URL matches poem patterns
-            if 'poem_patterns' in site_config:
-                for pattern in site_config['poem_patterns']:
-                    if re.match(pattern, parsed_url.path):
-                        # Check if it should be excluded
-                        should_exclude = False
-                        if 'exclude_patterns' in site_config:
-                            for exclude_pattern in site_config['exclude_patterns']:
-                                if re.search(exclude_pattern, parsed_url.path):
-                                    should_exclude = True
-                                    break
-                        
-                        if not should_exclude:
-                            discovered_links.add(absolute_url)
-                            print(f"  📝 Pattern match found: {absolute_url}")
-                            break
-        
-        # Method 3: Look for common poem indicators in link text (ENHANCED)
-        poem_text_indicators = [
-            'poem', 'poetry', 'verse', 'sonnet', 'haiku', 'ballad',
-            'elegy', 'ode', 'limerick', 'free verse'
-        ]
+            if absolute_url not in seen and (selector_hit or _link_rule(absolute_url, text, classifier)):
+                seen.add(absolute_url)
+                yield absolute_url
+    
+    try:
+        with closing(http_stream(base_url, timeout=15, use_cache=True, kind='index',
+                                 on_headers=headers.update)) as chunks:
+            for chunk in chunks:
+                if decoder is None:
+                    # Pick the decoder from the header or the first kilobyte, defaulting to UTF-8
+                    encoding = detect_encoding(chunk, headers.get('Content-Type')) or 'utf-8'
+                    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                parser.feed(decoder.decode(chunk))
+                yield from new_links()
+        if decoder is not None:
+            parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        yield from new_links()
+    except Exception as e:
+        print(f"❌ Error streaming links from {base_url}: {e}")
+    
+    print(f"✅ Streamed {len(seen)} potential poem links from {base_url}")
+
+def iter_domain_poem_links(domain: str, max_links: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream poem URLs from a domain's base URLs in order, stopping at max_links
+    
+    Later base URLs are only fetched if the earlier ones did not provide enough links.
+    
+    Args:
+        domain: Domain name (e.g., 'poems.com')
+        max_links: Maximum number of links to yield (None for no limit)
         
-        # ENHANCED: Exclude terms that indicate non-poem content
-        exclude_text_indicators = [
-            'review', 'essay', 'interview', 'conversation', 'profile',
-            'announcement', 'news', 'winner', 'prize', 'award', 'wins',
-            'selected poems', 'new and selected', 'building the perfect',
-            'lightness', 'marie howe', 'ruth lilly', 'critical essay',
-            'about', 'biography', 'memoir', 'craft essay', 'poetics'
-        ]
+    Returns:
+        Iterator of unique poem URLs
+    """
+    config = SITE_CONFIGS[domain]
+    seen = set()
+    
+    def unique_links():
+        for base_url in config['base_urls']:
+            with closing(iter_poem_links(base_url, config)) as links:
+                for link in links:
+                    if link not in seen:
+                        seen.add(link)
+                        yield link
+    
+    return islice(unique_links(), max_links)
+
+async def _stream_domain(domain: str, max_links: int) -> List[str]:
+    """
+    Stream-discover one domain in a worker thread
+    
+    Args:
+        domain: Domain name
+        max_links: Number of links after which downloading stops
         
-        for link in all_links:
-            href = link.get('href', '')
-            link_text = link.get_text().lower().strip()
-            
-            # Check if link text contains poem indicators
-            has_poem_indicator = any(indicator in link_text for indicator in poem_text_indicators)
-            
-            # Check if link text contains exclusion indicators
-            has_exclude_indicator = any(indicator in link_text for indicator in exclude_text_indicators)
-            
-            if href and has_poem_indicator and not has_exclude_indicator:
-                absolute_url = urljoin(base_url, href)
-                parsed_url = urlparse(absolute_url)
-                
-                # Enhanced exclusion check
-                exclude_terms = [
-                    'about', 'contact', 'submit', 'subscribe', 'search', 'browse',
-                    'review', 'essay', 'interview', 'conversation', 'profile',
-                    'announcement', 'news', 'winner', 'prize', 'award', 'wins',
-                    'lightness', 'marie-howe', 'ruth-lilly', 'critical-essay',
-                    'building-the-perfect', 'new-and-selected'
-                ]
-                
-                if not any(term in parsed_url.path.lower() for term in exclude_terms):
-                    discovered_links.add(absolute_url)
-                    print(f"  📖 Text indicator found: {absolute_url}")
+    Returns:
+        List of discovered poem URLs
+    """
+    try:
+        return await asyncio.to_thread(lambda: list(iter_domain_poem_links(domain, max_links)))
+    except Exception as e:
+        print(f"❌ Failed to stream links for {domain}: {e}")
+        return []
+
+async def _discover_base_url(base_url: str, config: Dict) -> List[str]:
+    """
+    Discover poem links from one base URL in a worker thread
+    
+    Per-host politeness is enforced by the request scheduler in http_client.
+    
+    Args:
+        base_url: The base URL to start discovery from
+        config: Site configuration for the domain
         
+    Returns:
+        List of discovered poem URLs
+    """
+    try:
+        return await asyncio.to_thread(get_poem_links, base_url, config)
     except Exception as e:
-        print(f"❌ Error discovering links from {base_url}: {e}")
+        print(f"❌ Failed to discover links from {base_url}: {e}")
+        return []
+
+async def discover_all_poem_links_async(domains: Optional[List[str]] = None,
+                                        max_links: Optional[int] = 50) -> Dict[str, List[str]]:
+    """
+    Discover poem links for several domains concurrently
     
-    # Convert to sorted list and remove duplicates
-    unique_links = list(discovered_links)
-    unique_links.sort()
+    All domains are fetched at the same time; requests to the same host are
+    spaced by that host's token bucket. Without a limit every base URL is
+    parsed in full; with one, each domain's index pages are streamed and the
+    download stops as soon as max_links links were found.
     
-    print(f"✅ Discovered {len(unique_links)} potential poem links from {base_url}")
-    return unique_links
+    Args:
+        domains: Domains to discover (defaults to every domain in SITE_CONFIGS)
+        max_links: Maximum number of links to return per domain (None for no limit)
+        
+    Returns:
+        Dict mapping each domain to its list of discovered poem URLs
+    """
+    if domains is None:
+        domains = list(SITE_CONFIGS.keys())
+    
+    tasks = []
+    task_domains = []
+    
+    for domain in domains:
+        if domain not in SITE_CONFIGS:
+            print(f"❌ No configuration found for domain: {domain}")
+            continue
+        
+        config = SITE_CONFIGS[domain]
+        print(f"🌐 Discovering poem links for {config['name']} ({domain})")
+        
+        # With a limit, stop downloading index pages once enough links are found
+        if max_links is not None and PARSER_SETTINGS.get('streaming_discovery', True):
+            tasks.append(_stream_domain(domain, max_links))
+            task_domains.append(domain)
+            continue
+        
+        for base_url in config['base_urls']:
+            tasks.append(_discover_base_url(base_url, config))
+            task_domains.append(domain)
+    
+    results = await asyncio.gather(*tasks)
+    
+    all_links = {domain: set() for domain in domains if domain in SITE_CONFIGS}
+    for domain, links in zip(task_domains, results):
+        all_links[domain].update(links)
+    
+    discovered = {}
+    for domain, links in all_links.items():
+        final_links = sorted(links)
+        if max_links is not None:
+            final_links = final_links[:max_links]
+        discovered[domain] = final_links
+        print(f"🎯 Total discovered links for {domain}: {len(final_links)}")
+    
+    return discovered
+
+def discover_all_domains(domains: Optional[List[str]] = None,
+                         max_links: Optional[int] = 50) -> Dict[str, List[str]]:
+    """
+    Blocking wrapper around discover_all_poem_links_async
+    
+    Args:
+        domains: Domains to discover (defaults to every domain in SITE_CONFIGS)
+        max_links: Maximum number of links to return per domain (None for no limit)
+        
+    Returns:
+        Dict mapping each domain to its list of discovered poem URLs
+    """
+    return asyncio.run(discover_all_poem_links_async(domains, max_links))
 
-def discover_all_poem_links(domain: str, max_links: int = 50) -> List[str]:
+def discover_all_poem_links(domain: str, max_links: Optional[int] = 50) -> List[str]:
     """
     Discover poem links from all configured URLs for a domain
     
     Args:
         domain: Domain name (e.g., 'poems.com')
-        max_links: Maximum number of links to return
+        max_links: Maximum number of links to return (None for no limit)
         
     Returns:
         List of discovered poem URLs
@@ -351,67 +573,100 @@ def discover_all_poem_links(domain: str, max_links: int = 50) -> List[str]:
         print(f"❌ No configuration found for domain: {domain}")
         return []
     
-    config = SITE_CONFIGS[domain]
-    all_links = set()
+    return discover_all_domains([domain], max_links).get(domain, [])
+
+# Words that suggest a page holds a poem
+POEM_PAGE_INDICATORS = [
+    'poem', 'poetry', 'verse', 'stanza', 'line break',
+    'metaphor', 'imagery', 'rhythm', 'rhyme'
+]
+
+# Words that suggest other content (essays, news, etc.)
+NON_POEM_PAGE_INDICATORS = [
+    'essay', 'article', 'review', 'interview', 'news',
+    'announcement', 'press release', 'biography', 'about the author',
+    'table of contents', 'subscribe', 'newsletter'
+]
+
+# Main-content containers scored in 'region' validation mode, outermost first
+VALIDATION_REGION_SELECTORS = compile_selectors([
+    'main', '[role="main"]', 'article', '.entry-content', '.post-content',
+    '.elementor-widget-theme-post-content', '.poem-content', '.poem-text', '.poem'
+])
+
+def _score_indicators(text: str):
+    """Return (poem_score, non_poem_score) for lower-cased text"""
+    poem_score = sum(1 for indicator in POEM_PAGE_INDICATORS if indicator in text)
+    non_poem_score = sum(1 for indicator in NON_POEM_PAGE_INDICATORS if indicator in text)
+    return poem_score, non_poem_score
+
+def _looks_like_poem_region(strings: Iterator[str]) -> Optional[bool]:
+    """
+    Score text node by node, stopping once the verdict cannot change
     
-    print(f"🌐 Discovering poem links for {config['name']} ({domain})")
+    Each indicator counts once, as in the full-text scoring. The tail of the
+    previous node is carried over so indicators split across nodes still match.
     
-    # Try each base URL
-    for base_url in config['base_urls']:
-        try:
-            links = get_poem_links(base_url, config)
-            all_links.update(links)
-            
-            # Add delay between requests to be respectful
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"❌ Failed to discover links from {base_url}: {e}")
+    Args:
+        strings: Text nodes of the region, in document order
+        
+    Returns:
+        True if more poem indicators than non-poem indicators were found,
+        None if the region contains no indicator at all
+    """
+    poem_found, non_poem_found = set(), set()
+    overlap = max(len(indicator) for indicator in POEM_PAGE_INDICATORS + NON_POEM_PAGE_INDICATORS) - 1
+    tail = ''
     
-    # Convert to list and limit results
-    final_links = list(all_links)[:max_links]
+    for string in strings:
+        window = tail + string.lower()
+        tail = window[-overlap:]
+        poem_found.update(indicator for indicator in POEM_PAGE_INDICATORS if indicator in window)
+        non_poem_found.update(indicator for indicator in NON_POEM_PAGE_INDICATORS if indicator in window)
+        
+        poem_left = len(POEM_PAGE_INDICATORS) - len(poem_found)
+        non_poem_left = len(NON_POEM_PAGE_INDICATORS) - len(non_poem_found)
+        if len(poem_found) > len(non_poem_found) + non_poem_left:
+            return True
+        if len(poem_found) + poem_left <= len(non_poem_found):
+            return False
     
-    print(f"🎯 Total discovered links for {domain}: {len(final_links)}")
-    return final_links
+    if not poem_found and not non_poem_found:
+        return None
+    return len(poem_found) > len(non_poem_found)
 
 def validate_poem_url(url: str) -> bool:
     """
     Validate that a URL actually contains a poem
     
+    In the default 'region' mode only the page's main-content region is
+    scored, node by node, with an early exit; the rest of the page is only
+    read when the region mentions no indicator at all.
+    PARSER_SETTINGS['validation_mode'] = 'full' scores the text of the whole
+    document instead.
+    
     Args:
         url: URL to validate
         
     Returns:
         True if URL contains a poem, False otherwise
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)',
-        'Accept': 'text/html,application/xhtml+xml'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10, kind='poem')
         if response.status_code != 200:
             return False
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text = soup.get_text().lower()
-        
-        # Look for poem indicators
-        poem_indicators = [
-            'poem', 'poetry', 'verse', 'stanza', 'line break',
-            'metaphor', 'imagery', 'rhythm', 'rhyme'
-        ]
+        soup = make_soup(response.content, prune=True, encoding=response_encoding(response))
         
-        # Look for non-poem indicators (essays, news, etc.)
-        non_poem_indicators = [
-            'essay', 'article', 'review', 'interview', 'news',
-            'announcement', 'press release', 'biography', 'about the author',
-            'table of contents', 'subscribe', 'newsletter'
-        ]
+        if PARSER_SETTINGS.get('validation_mode', 'region') == 'region':
+            page = soup.body or soup
+            region = next((element for _, element in select_first(soup, VALIDATION_REGION_SELECTORS)), page)
+            verdict = _looks_like_poem_region(region.strings)
+            if verdict is None and region is not page:
+                verdict = _looks_like_poem_region(page.strings)
+            return bool(verdict)
         
-        poem_score = sum(1 for indicator in poem_indicators if indicator in text)
-        non_poem_score = sum(1 for indicator in non_poem_indicators if indicator in text)
+        poem_score, non_poem_score = _score_indicators(soup.get_text().lower())
         
         # Simple scoring: more poem indicators than non-poem indicators
         return poem_score > non_poem_score
@@ -445,6 +700,27 @@ def test_poem_discovery():
         
         print("-" * 40)
 
+async def _validate_links_async(links_by_domain: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Validate links for several domains concurrently
+    
+    Args:
+        links_by_domain: Dict mapping each domain to the links to validate
+        
+    Returns:
+        Dict mapping each domain to the links that passed validation, in input order
+    """
+    domains = list(links_by_domain.keys())
+    results = await asyncio.gather(*[
+        asyncio.gather(*[asyncio.to_thread(validate_poem_url, link) for link in links_by_domain[domain]])
+        for domain in domains
+    ])
+    
+    return {
+        domain: [link for link, is_valid in zip(links_by_domain[domain], verdicts) if is_valid]
+        for domain, verdicts in zip(domains, results)
+    }
+
 def save_discovered_links(output_file: str = 'discovered_poem_links.json'):
     """
     Discover and save all poem links to a JSON file
@@ -454,17 +730,19 @@ def save_discovered_links(output_file: str = 'discovered_poem_links.json'):
     """
     all_discovered = {}
     
-    for domain in SITE_CONFIGS.keys():
+    # Discover every configured domain concurrently
+    discovered_by_domain = discover_all_domains(max_links=100)
+    
+    # Validate the first 20 links of each domain; hosts are validated in parallel
+    validated_by_domain = asyncio.run(_validate_links_async({
+        domain: links[:20] for domain, links in discovered_by_domain.items() if links
+    }))
+    
+    for domain, links in discovered_by_domain.items():
         print(f"\n🔍 Processing {domain}...")
-        links = discover_all_poem_links(domain, max_links=100)
         
         if links:
-            # Validate a sample of links
-            validated_links = []
-            for link in links[:20]:  # Validate first 20 links
-                if validate_poem_url(link):
-                    validated_links.append(link)
-                time.sleep(0.5)  # Be respectful with validation requests
+            validated_links = validated_by_domain[domain]
             
             all_discovered[domain] = {
                 'site_name': SITE_CONFIGS[domain]['name'],
@@ -484,6 +762,8 @@ def save_discovered_links(output_file: str = 'discovered_poem_links.json'):
     print("\n📊 Discovery Summary:")
     for domain, data in all_discovered.items():
         print(f"   {data['site_name']}: {data['total_discovered']} discovered, {len(data['validated_links'])} validated")
+    
+    print_aborted_downloads()
 
 if __name__ == "__main__":
     # Run the test
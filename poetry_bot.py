@@ -1,19 +1,22 @@
 import os
 import random
-import requests
 import tweepy
 from datetime import datetime, timedelta
 import openai
 import google.generativeai as genai
 import anthropic
 import textwrap
-from bs4 import BeautifulSoup
 import json
 from dotenv import load_dotenv
 from config import *
-from poem_link_discovery import get_poem_links, SITE_CONFIGS
+from poem_link_discovery import discover_all_domains, SITE_CONFIGS
+from http_client import http_get, check_url_status, print_aborted_downloads, response_encoding, start_run_budget
+from journal_health import JournalHealth
+from parse_sandbox import UNPARSEABLE, sandboxed_parse
+from poem_extraction import extract_poem_from_html
 from urllib.parse import urlparse
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,6 +32,10 @@ POETRY_THEMES = [
 
 class PoetryBot:
     def __init__(self):
+        # Seed shuffling when a reproducible run is requested (e.g. cassette replay)
+        if BOT_SETTINGS.get('random_seed') is not None:
+            random.seed(BOT_SETTINGS['random_seed'])
+        
         # Initialize Twitter API
         self.setup_twitter()
         
@@ -47,6 +54,13 @@ class PoetryBot:
         # Cache discovered poem URLs to avoid repeated discovery
         self.poem_url_cache = {}
         
+        # Journals whose discovery produced nothing are skipped until their backoff expires
+        self.journal_health = JournalHealth(
+            BOT_SETTINGS.get('journal_health_file', 'poetrydata/journal_health.json'),
+            base_backoff=BOT_SETTINGS.get('journal_backoff_base_hours', 1) * 3600,
+            max_backoff=BOT_SETTINGS.get('journal_backoff_max_hours', 72) * 3600
+        )
+        
     def setup_twitter(self):
         """Set up Twitter API v2 connection"""
         try:
@@ -140,19 +154,8 @@ class PoetryBot:
             print(f"🔍 Discovering poem URLs for {domain}...")
             
             if domain in SITE_CONFIGS:
-                config = SITE_CONFIGS[domain]
-                all_urls = []
-                
-                # Try each base URL
-                for base_url in config['base_urls']:
-                    try:
-                        urls = get_poem_links(base_url, config)
-                        all_urls.extend(urls)
-                    except Exception as e:
-                        print(f"⚠️  Failed to discover from {base_url}: {e}")
-                
-                # Remove duplicates and cache
-                unique_urls = list(set(all_urls))
+                # Fetch every base URL of the domain concurrently and cache
+                unique_urls = discover_all_domains([domain], max_links=None).get(domain, [])
                 self.poem_url_cache[domain] = unique_urls
                 print(f"✅ Cached {len(unique_urls)} poem URLs for {domain}")
             else:
@@ -183,177 +186,128 @@ class PoetryBot:
                 # Get domain from journal URL
                 domain = urlparse(journal['url']).netloc
                 
+                if self.journal_health.should_skip(domain):
+                    hours = self.journal_health.seconds_until_retry(domain) / 3600
+                    print(f"⏭️  Skipping {domain} - backing off for another {hours:.1f}h")
+                    continue
+                
                 # Get poem URLs for this domain
                 poem_urls = self.get_poem_urls_for_domain(domain)
                 
                 if not poem_urls:
                     print(f"⚠️  No poem URLs found for {domain}")
+                    reason = 'no poem URLs discovered' if domain in SITE_CONFIGS else 'no site configuration'
+                    self.journal_health.record_failure(domain, reason)
                     continue
                 
+                self.journal_health.record_success(domain)
+                
                 # Try random poem URLs from this domain
                 random.shuffle(poem_urls)
+                candidates = poem_urls[:BOT_SETTINGS.get('candidates_per_journal', 5)]
+                
+                if BOT_SETTINGS.get('speculative_extraction', False):
+                    poem_url, poem = self.try_poem_candidates_speculatively(candidates, journal['name'])
+                else:
+                    poem_url, poem = self.try_poem_candidates(candidates, journal['name'])
                 
-                for poem_url in poem_urls[:5]:  # Try up to 5 URLs
-                    print(f"  📄 Trying poem at: {poem_url}")
-                    poem = self.extract_poem_from_url(poem_url, journal['name'])
-                    
-                    if poem:
-                        # Apply diversity filters (only if enabled)
-                        if self.should_avoid_author(poem['author']):
-                            print(f"⏭️  Skipping poem by {poem['author']} - author already featured today")
-                            continue
-                        
-                        # Validate the poem content
-                        is_valid, message = self.validate_poem_content(poem, poem_url)
-                        if is_valid:
-                            print(f"✅ Found valid poem from {journal['name']}")
-                            # Track this selection
-                            self.daily_posts['sources'].append(journal['name'])
-                            self.daily_posts['authors'].append(poem['author'])
-                            poem['url'] = poem_url  # Store the source URL
-                            return poem
-                        else:
-                            print(f"⚠️  Poem from {journal['name']} failed validation: {message}")
-                            continue
+                if poem:
+                    print(f"✅ Found valid poem from {journal['name']}")
+                    # Track this selection
+                    self.daily_posts['sources'].append(journal['name'])
+                    self.daily_posts['authors'].append(poem['author'])
+                    poem['url'] = poem_url  # Store the source URL
+                    return poem
                 
             except Exception as e:
                 print(f"❌ {journal['name']} failed with error: {e}")
+                self.journal_health.record_failure(urlparse(journal['url']).netloc, str(e))
                 continue
         
         print("📚 No valid poems found from literary journals")
         return None
 
+    def try_poem_candidate(self, poem_url, source_name, cancel_event=None):
+        """Extract and validate one candidate poem URL, returning the poem or None"""
+        if cancel_event and cancel_event.is_set():
+            return None
+        
+        print(f"  📄 Trying poem at: {poem_url}")
+        poem = self.extract_poem_from_url(poem_url, source_name)
+        
+        if not poem or (cancel_event and cancel_event.is_set()):
+            return None
+        
+        # Apply diversity filters (only if enabled)
+        if self.should_avoid_author(poem['author']):
+            print(f"⏭️  Skipping poem by {poem['author']} - author already featured today")
+            return None
+        
+        # Validate the poem content
+        is_valid, message = self.validate_poem_content(poem, poem_url)
+        if not is_valid:
+            print(f"⚠️  Poem from {source_name} failed validation: {message}")
+            return None
+        
+        return poem
+
+    def try_poem_candidates(self, poem_urls, source_name):
+        """Try candidate URLs one after another; return (url, poem) for the first valid one"""
+        for poem_url in poem_urls:
+            poem = self.try_poem_candidate(poem_url, source_name)
+            if poem:
+                return poem_url, poem
+        return None, None
+
+    def try_poem_candidates_speculatively(self, poem_urls, source_name):
+        """Try all candidate URLs concurrently; return (url, poem) for the first valid one in list order
+        
+        Candidates are fetched and validated in parallel, but results are still
+        taken in the given (shuffled) order, so the choice is the same one the
+        sequential path would make. Losing candidates are cancelled.
+        """
+        if not poem_urls:
+            return None, None
+        
+        cancel_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(poem_urls))
+        try:
+            futures = [executor.submit(self.try_poem_candidate, poem_url, source_name, cancel_event)
+                       for poem_url in poem_urls]
+            
+            for poem_url, future in zip(poem_urls, futures):
+                try:
+                    poem = future.result()
+                except Exception as e:
+                    print(f"❌ Candidate {poem_url} failed with error: {e}")
+                    continue
+                if poem:
+                    return poem_url, poem
+            
+            return None, None
+        finally:
+            # Stop candidates that have not finished yet; their results are no longer needed
+            cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def extract_poem_from_url(self, url, source_name="Unknown"):
         """Extract poem content from a specific URL"""
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, timeout=15, use_cache=True, kind='poem')
             
             if response.status_code != 200:
                 print(f"❌ HTTP {response.status_code} for {url}")
                 return None
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title - try multiple selectors
-            title = "Untitled"
-            
-            # First try to extract from page title (Poetry Daily specific)
-            page_title_elem = soup.find('title')
-            if page_title_elem:
-                page_title = page_title_elem.get_text().strip()
-                if ' – Poetry Daily' in page_title:
-                    title = page_title.replace(' – Poetry Daily', '').strip()
-            
-            # If that didn't work, try other selectors
-            if title == "Untitled":
-                title_selectors = [
-                    'h2',  # Poetry Daily uses h2 for poem titles
-                    'h1', 'h2.title', '.poem-title', '.title', 
-                    'h1.entry-title', 'h2.entry-title', '.post-title'
-                ]
-                
-                for selector in title_selectors:
-                    title_elem = soup.select_one(selector)
-                    if title_elem:
-                        candidate_title = title_elem.get_text().strip()
-                        # Skip generic titles
-                        if candidate_title and candidate_title not in ['Featured Poet', 'Featured Translator', 'Receive POETRY DAILY']:
-                            title = candidate_title
-                            break
-            
-            # Extract author - try multiple selectors
-            author = "Unknown"
-            author_selectors = [
-                '.daily_poem_author',  # Poetry Daily specific
-                '.author', '.poet', '.byline', '.poem-author',
-                'span.author', 'p.author', 'div.author',
-                'a[href*="/poet"]', 'a[href*="/author"]'
-            ]
-            
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    candidate_author = author_elem.get_text().strip()
-                    # Clean up author name
-                    candidate_author = re.sub(r'^(by\s+)', '', candidate_author, flags=re.IGNORECASE)
-                    candidate_author = re.sub(r'(,.*$)', '', candidate_author)
-                    # Skip non-author text
-                    if candidate_author and candidate_author not in ['Instagram', 'Facebook', 'Twitter']:
-                        author = candidate_author
-                        break
-            
-            # If no author found, try text patterns
-            if author == "Unknown":
-                text_content = soup.get_text()
-                author_match = re.search(r'by\s+([^\n,]+)', text_content, re.IGNORECASE)
-                if author_match:
-                    author = author_match.group(1).strip()
-            
-            # Extract poem text - try multiple selectors
-            poem_content = None
-            poem_selectors = [
-                '.elementor-widget-theme-post-content',  # Poetry Daily specific
-                '.poem', '.poetry', '.poem-text', '.poem-content', 
-                '.verse', 'pre.poem', '.entry-content', 
-                'main', 'article', '.post-content'
-            ]
-            
-            for selector in poem_selectors:
-                content = soup.select_one(selector)
-                if content:
-                    poem_content = content
-                    break
-            
-            if not poem_content:
-                print(f"⚠️  No poem content found at {url}")
-                return None
-            
-            # Extract and clean poem text
-            poem_text = poem_content.get_text(separator='\n').strip()
-            lines = [line.strip() for line in poem_text.split('\n') if line.strip()]
-            
-            # Clean up lines - remove navigation, metadata, etc.
-            clean_lines = []
-            exclude_patterns = [
-                'subscribe', 'newsletter', 'archive', 'browse', 'search',
-                'about', 'contact', 'home', 'menu', 'navigation',
-                'read more', 'continue reading', 'full text',
-                'print issues', 'buy now', 'purchase', 'add to cart',
-                'interviews', 'reviews', 'submissions', 'guidelines',
-                'editorial', 'editor', 'staff', 'masthead',
-                'winner', 'finalist', 'contest', 'award',
-                'university', 'college', 'press', 'publisher',
-                'www.', 'http', '.com', '.org'
-            ]
             
-            for line in lines:
-                line_lower = line.lower()
-                
-                # Skip if contains title, author, or excluded patterns
-                if (title.lower() not in line_lower and 
-                    author.lower() not in line_lower and
-                    'by ' not in line_lower[:10] and
-                    not any(pattern in line_lower for pattern in exclude_patterns) and
-                    len(line.strip()) > 5 and
-                    not line.strip().startswith('(') and
-                    not line.strip().endswith(')') and
-                    '//' not in line):
-                    clean_lines.append(line)
-            
-            # Take first 20 lines of actual poem content
-            poem_text = '\n'.join(clean_lines[:20])
+            if PARSER_SETTINGS.get('sandbox', False):
+                poem = sandboxed_parse('poem', response.content, url, source_name,
+                                       encoding=response_encoding(response))
+                if poem is UNPARSEABLE:
+                    print(f"⚠️  Skipping unparseable page {url}")
+                    return None
+                return poem
             
-            if len(poem_text) > 50 and len(clean_lines) >= 3:
-                return {
-                    'title': title,
-                    'author': author,
-                    'text': poem_text,
-                    'source': source_name
-                }
-            
-            print(f"⚠️  Insufficient poem content after cleaning from {url}")
-            return None
+            return extract_poem_from_html(response.content, url, source_name, encoding=response_encoding(response))
             
         except Exception as e:
             print(f"❌ Poem extraction failed for {url}: {e}")
@@ -630,10 +584,9 @@ class PoetryBot:
         # If URL provided, validate it exists and is accessible
         if url:
             try:
-                headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-                response = requests.head(url, headers=headers, timeout=10, allow_redirects=True)
-                if response.status_code >= 400:
-                    return False, f"URL not accessible: {response.status_code}"
+                status = check_url_status(url, timeout=10)
+                if status >= 400:
+                    return False, f"URL not accessible: {status}"
             except Exception as e:
                 return False, f"URL validation failed: {e}"
         
@@ -664,10 +617,9 @@ class PoetryBot:
         # If URL included, make sure it's valid
         if url and url in tweet_text:
             try:
-                headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-                response = requests.head(url, headers=headers, timeout=5)
-                if response.status_code >= 400:
-                    return False, f"Tweet contains broken URL: {response.status_code}"
+                status = check_url_status(url, timeout=5, allow_redirects=False)
+                if status >= 400:
+                    return False, f"Tweet contains broken URL: {status}"
             except:
                 return False, "Tweet contains invalid URL"
         
@@ -733,8 +685,13 @@ class PoetryBot:
         return tweet_text[:280]  # Final safety truncation
 
     def post_to_twitter(self, poem):
-        """Post poem to Twitter using API v2 with validation (text only)"""
-        if not hasattr(self, 'twitter_client') or not self.twitter_client:
+        """Post poem to Twitter using API v2 with validation (text only)
+        
+        While HTTP cassettes are recording or replaying the run is a dry run:
+        the tweet is validated and previewed but never posted.
+        """
+        dry_run = HTTP_SETTINGS.get('cassette_mode', 'off') != 'off'
+        if not dry_run and (not hasattr(self, 'twitter_client') or not self.twitter_client):
             print("❌ Twitter API v2 not available")
             return False
             
@@ -754,6 +711,10 @@ class PoetryBot:
             print(tweet_text)
             print("-" * 50)
             
+            if dry_run:
+                print(f"📼 Cassette {HTTP_SETTINGS['cassette_mode']} run - dry run, not posting to Twitter")
+                return True
+            
             # Post using Twitter API v2 (text only)
             response = self.twitter_client.create_tweet(text=tweet_text)
             
@@ -773,6 +734,9 @@ class PoetryBot:
         """Main bot execution - Now Twitter Focused and Text Only"""
         print("🤖 Poetry Bot (Twitter Focused, Text Only) starting...")
         
+        # Bound fetch retries so they never push this post past its slot
+        start_run_budget()
+        
         # Check if we need to reset daily tracking
         self.check_daily_reset()
         
@@ -791,6 +755,7 @@ class PoetryBot:
         if not poem:
             print("❌ Failed to get any valid poem from literary journals")
             print("🚫 NEVER posting AI-generated content - only real poems from literary sources")
+            print_aborted_downloads()
             return False
             
         print(f"📝 Selected poem: '{poem['title']}' by {poem['author']}")
@@ -817,6 +782,7 @@ class PoetryBot:
             
         # Print daily summary
         self.print_daily_summary()
+        print_aborted_downloads()
             
         if success:
             print(f"🎉 Twitter Poetry bot completed successfully! (Post {post_number}/{total_posts})")
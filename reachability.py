@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Reachability verdict cache
+Remembers the HTTP status of every URL the bot fetched, in memory and on disk,
+so validators only go back to the network when the verdict is stale
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class ReachabilityCache:
+    """URL -> (status, checked_at) map with a TTL, persisted as one JSON file"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self.entries = None
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def _load(self):
+        # Called with the lock held
+        if self.entries is not None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def record(self, url: str, status: int):
+        """
+        Remember the status a URL answered with
+
+        Server errors are not recorded since they are usually transient.
+
+        Args:
+            url: URL that was requested
+            status: Final HTTP status code
+        """
+        if status >= 500:
+            return
+        with self.lock:
+            self._load()
+            self.entries[url] = {'status': status, 'checked_at': time.time()}
+            self.dirty = True
+
+    def lookup(self, url: str) -> Optional[int]:
+        """
+        Return the cached status for a URL if it is still fresh
+
+        Args:
+            url: URL to look up
+
+        Returns:
+            The HTTP status code, or None if unknown or stale
+        """
+        with self.lock:
+            self._load()
+            entry = self.entries.get(url)
+        if entry and time.time() - entry['checked_at'] < self.ttl:
+            return entry['status']
+        return None
+
+    def save(self):
+        """Write fresh entries to disk, dropping expired ones"""
+        with self.lock:
+            if not self.dirty:
+                return
+            now = time.time()
+            fresh = {url: entry for url, entry in self.entries.items()
+                     if now - entry['checked_at'] < self.ttl}
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path + '.tmp', 'w') as f:
+                    json.dump(fresh, f)
+                os.replace(self.path + '.tmp', self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save reachability cache: {e}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Per-host politeness scheduler
+Each host gets its own token bucket, so requests to different journals run in
+parallel while requests to the same journal are spaced only as much as needed
+"""
+
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+
+def normalize_host(host: str) -> str:
+    """Lower-case a host and drop a leading 'www.' so both spellings share a bucket"""
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers that overdraw wait for their reserved slot"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until this caller's token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """Hands out per-host token buckets, with optional per-host rate overrides"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def set_rate(self, host: str, rate: float, burst: Optional[int] = None):
+        """
+        Override the rate limit for one host
+
+        Args:
+            host: Host or domain name (a leading 'www.' is ignored)
+            rate: Requests per second allowed to the host
+            burst: Requests that may be sent back to back (defaults to the global burst)
+        """
+        host = normalize_host(host)
+        with self.lock:
+            self.overrides[host] = (rate, burst if burst is not None else self.burst)
+            self.buckets.pop(host, None)
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        """Return the bucket for a host, creating it on first use"""
+        host = normalize_host(host)
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        """
+        Block until a request to the URL's host may be sent
+
+        Args:
+            url: URL about to be requested
+        """
+        host = urlparse(url).netloc
+        if host:
+            self.bucket_for(host).acquire()
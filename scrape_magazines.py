@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 import logging
 from datetime import datetime
@@ -32,7 +32,7 @@ class MagazineScraper:
             response = requests.get(self.url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # Print the entire HTML for inspection
             print("HTML Content:")
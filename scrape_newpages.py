@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 from datetime import datetime
 import time
@@ -53,7 +53,7 @@ class NewPagesScraper:
             time.sleep(5)
             
             # Get the page source after JavaScript has rendered
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = make_soup(self.driver.page_source)
             
             # Find all magazine entries
             magazine_entries = soup.find_all("article", class_="post")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Per-domain selector win counts for poem extraction
+Each journal's pages are built from one template, so a selector that has
+clearly dominated a field on a domain is tried first next time
+"""
+
+import atexit
+import json
+import os
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from config import PARSER_SETTINGS
+from request_scheduler import normalize_host
+
+
+class SelectorProfiles:
+    """Persisted domain -> field -> selector -> win count map"""
+
+    def __init__(self, path: str, min_share: float = 0.8, min_wins: int = 3):
+        self.path = path
+        self.min_share = min_share
+        self.min_wins = min_wins
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.pending = None
+        self.profiles = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def ordered(self, domain: str, field: str, selectors: Sequence) -> List:
+        """
+        Move the domain's dominant selector for a field to the front
+
+        A selector is only promoted over the more specific ones ahead of it in
+        the default order once it has at least min_wins wins and min_share of
+        all wins for the field, so a broad selector ('main', 'article') that
+        won a few odd pages does not displace the template's own selector.
+
+        Args:
+            domain: Journal host
+            field: 'title', 'author' or 'poem'
+            selectors: Compiled selectors in their default priority order
+
+        Returns:
+            The selectors in default order, with the dominant one (if any) first
+        """
+        with self.lock:
+            wins = dict(self.profiles.get(normalize_host(domain), {}).get(field, {}))
+        selectors = list(selectors)
+        total = sum(wins.values())
+        for index, selector in enumerate(selectors):
+            count = wins.get(selector.pattern, 0)
+            if count >= self.min_wins and count >= self.min_share * total:
+                return [selector] + selectors[:index] + selectors[index + 1:]
+        return selectors
+
+    def record(self, domain: str, winners: Dict[str, str]):
+        """
+        Count the selectors that produced an accepted poem
+
+        Args:
+            domain: Journal host
+            winners: Field -> selector pattern that supplied it
+        """
+        domain = normalize_host(domain)
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((domain, dict(winners)))
+                return
+            profile = self.profiles.setdefault(domain, {})
+            for field, pattern in winners.items():
+                counts = profile.setdefault(field, {})
+                counts[pattern] = counts.get(pattern, 0) + 1
+            self.dirty = True
+
+    def collect_only(self):
+        """
+        Queue wins for drain() instead of counting them
+
+        Used in parse worker processes, which hand their wins back to the
+        parent rather than writing the shared profile file.
+        """
+        with self.lock:
+            self.pending = []
+
+    def drain(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Return and clear the (domain, winners) records queued by collect_only()"""
+        with self.lock:
+            if self.pending is None:
+                return []
+            pending, self.pending = self.pending, []
+        return pending
+
+    def save(self):
+        """Write the profiles to disk"""
+        with self.lock:
+            if not self.dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path + '.tmp', 'w') as f:
+                    json.dump(self.profiles, f, indent=2)
+                os.replace(self.path + '.tmp', self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save selector profiles: {e}")
+
+
+# Learned per-domain selector order, loaded at startup and saved on exit
+SELECTOR_PROFILES = SelectorProfiles(
+    PARSER_SETTINGS.get('selector_profile_file', 'poetrydata/selector_profiles.json'),
+    min_share=PARSER_SETTINGS.get('selector_promotion_share', 0.8),
+    min_wins=PARSER_SETTINGS.get('selector_promotion_min_wins', 3)
+)
+atexit.register(SELECTOR_PROFILES.save)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Equivalence check for the compiled poem line filter
+Runs clean_poem_lines and the original substring loop over the candidate lines
+of the sample pages and every recorded fixture page and reports any line they
+disagree on.
+
+Record more fixtures with:
+    POETRYBOT_CASSETTE_MODE=record python test_locally.py
+"""
+
+from html_parsing import make_soup
+from poem_extraction import LINE_EXCLUDE_PATTERNS, POEM_SELECTORS, clean_poem_lines
+from test_parser_backends import fixture_pages
+
+# Titles and authors the filter is run with, including awkward ones
+TITLE_AUTHOR_PAIRS = [
+    ('Untitled', 'Unknown'),
+    ('Daughter', 'Jane Doe'),
+    ('A', 'By'),
+    ('Home', 'Press')
+]
+
+# Lines that sit on the edges of each rule
+EDGE_LINES = [
+    'by the river we walked', 'Walked by the river', '1234567by the sea', '12345678by the sea',
+    '(an aside that closes)', '(an aside', 'an aside)', 'short', 'sixsix',
+    'see https://example.com', 'a // comment', 'The Press of the tide',
+    'WWW.EXAMPLE.ORG', 'İstanbul by night', 'the moon over the water'
+]
+
+
+def reference_clean_lines(lines, title, author):
+    """The line filter as originally written in extract_poem_from_url"""
+    clean_lines = []
+    for line in lines:
+        line_lower = line.lower()
+        if (title.lower() not in line_lower and
+            author.lower() not in line_lower and
+            'by ' not in line_lower[:10] and
+            not any(pattern in line_lower for pattern in LINE_EXCLUDE_PATTERNS) and
+            len(line.strip()) > 5 and
+            not line.strip().startswith('(') and
+            not line.strip().endswith(')') and
+            '//' not in line):
+            clean_lines.append(line)
+    return clean_lines
+
+
+def candidate_lines(body):
+    """Stripped text lines of every poem region and of the whole page"""
+    soup = make_soup(body)
+    regions = [soup] + [element for selector in POEM_SELECTORS for element in selector.select(soup)]
+    lines = []
+    for region in regions:
+        text = region.get_text(separator='\n')
+        lines.extend(line.strip() for line in text.split('\n') if line.strip())
+    return lines
+
+
+def test_compiled_filter_matches_reference():
+    """clean_poem_lines must keep exactly the lines the original loop kept"""
+    pages = [('edge cases', EDGE_LINES)] + [(url, candidate_lines(body)) for url, body in fixture_pages()]
+    mismatches = 0
+    for name, lines in pages:
+        for title, author in TITLE_AUTHOR_PAIRS:
+            expected = reference_clean_lines(lines, title, author)
+            actual = clean_poem_lines(lines, title, author)
+            if actual != expected:
+                mismatches += 1
+                print(f"❌ Filter differs for {name} (title={title!r}, author={author!r})")
+                print(f"   only reference: {[line for line in expected if line not in actual][:5]}")
+                print(f"   only compiled:  {[line for line in actual if line not in expected][:5]}")
+        print(f"✅ {name}: {len(lines)} lines checked")
+    assert not mismatches, f"{mismatches} filter run(s) differ from the reference"
+
+
+if __name__ == "__main__":
+    print("🧪 Comparing the compiled line filter with the original loop")
+    print("=" * 60)
+    test_compiled_filter_matches_reference()
+    print("\n🎉 Compiled filter matches the original on every line")
@@ -5,8 +5,8 @@ Now supports testing two posts per day with diversity tracking
 """
 
 import os
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parsing import make_soup
 import re
 from datetime import datetime
 from dotenv import load_dotenv
@@ -114,14 +114,13 @@ def extract_poetry_daily():
     """Extract today's poem from Poetry Daily"""
     try:
         url = 'https://poems.com/todays-poem/'
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"❌ Poetry Daily HTTP {response.status_code}")
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Find the main poem content
         poem_content = soup.find('div', class_='poem') or soup.find('div', id='poem') or soup.find('main')
@@ -227,14 +226,13 @@ def extract_verse_daily():
     """Extract today's poem from Verse Daily"""
     try:
         url = 'https://www.versedaily.org/'
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"❌ Verse Daily HTTP {response.status_code}")
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # Find today's poem
         poem_content = soup.find('div', class_='poem') or soup.find('main') or soup.find('article')
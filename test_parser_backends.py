@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Compatibility check for the HTML parser backends
+Runs poem and link extraction on the sample pages below and on every recorded
+fixture page with both lxml and html.parser and reports any page where the
+results differ. Also checks that stripping scripts, styles, comments and SVG
+before parsing changes nothing.
+
+Record more fixtures with:
+    POETRYBOT_CASSETTE_MODE=record python test_locally.py
+"""
+
+from urllib.parse import urlparse
+
+import pytest
+
+from config import HTTP_SETTINGS, PARSER_SETTINGS
+from html_parsing import strip_unused_blocks
+from http_cassette import Cassette
+from poem_extraction import extract_poem_from_html
+from poem_link_discovery import SITE_CONFIGS, extract_poem_links
+
+BACKENDS = ['lxml', 'html.parser']
+
+
+@pytest.fixture(autouse=True)
+def fixed_selector_order(monkeypatch):
+    """Compare the fixed selector order; learned profiles would change it between runs"""
+    monkeypatch.setitem(PARSER_SETTINGS, 'selector_profiles', False)
+
+
+# Small inline pages in the shape of the journals' templates, checked even
+# when no cassettes have been recorded
+SAMPLE_PAGES = [
+    ('https://poems.com/', b"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Poetry Daily</title></head>
+<body>
+<nav><a href="/about/">About</a> <a href="/subscribe/">Subscribe</a> <a href="/archives/">Archives</a></nav>
+<main>
+<h2><a href="/poem/the-orchard-in-winter/">The Orchard in Winter</a></h2>
+<ul>
+<li><a href="/poem/harbor-lights/">Harbor Lights</a></li>
+<li><a href="https://poems.com/poem/a-lantern-for-my-mother/">A Lantern for My Mother</a></li>
+<li><a href="/poem/harbor-lights/#comments">Comments</a></li>
+<li><a href="/news/spring-issue/">Spring issue news</a></li>
+</ul>
+</main>
+<footer><a href="/contact/">Contact</a></footer>
+</body></html>"""),
+    ('https://poems.com/poem/the-orchard-in-winter/', b"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<title>The Orchard in Winter \xe2\x80\x93 Poetry Daily</title>
+<meta property="og:title" content="The Orchard in Winter">
+</head>
+<body>
+<header><a href="/">Poetry Daily</a></header>
+<article>
+<h1 class="entry-title">The Orchard in Winter</h1>
+<div class="daily_poem_author">Marguerite Okafor</div>
+<div class="elementor-widget-theme-post-content">
+<p>Bare limbs hold the weight of the snow<br>
+the way my grandmother held bread,<br>
+carefully, as if it could still rise.</p>
+<p>Under the frost the roots keep count<br>
+of every April they remember,<br>
+and none of them are in a hurry.</p>
+</div>
+</article>
+<footer><p>Subscribe to receive a poem every day</p></footer>
+</body></html>"""),
+    ('https://example.org/journal/issue-12/tidewater', b"""<html><head><title>Tidewater | Example Review</title></head>
+<body>
+<div class="poem">
+<h1>Tidewater</h1>
+<p class="author">by Samuel Reyes</p>
+<p>Salt climbs the pilings one more inch<br>
+and the gulls argue over nothing,<br>
+the river forgetting which way is home.</p>
+<p>We stand where the water decides,<br>
+two coats on a bench in the fog,<br>
+listening to the marsh count its breaths.</p>
+</div>
+</body></html>""")
+]
+
+# Pages on the edges of the unused-block stripper
+STRIPPING_EDGE_PAGES = [
+    ('https://example.org/poems/self-closing-svg', b"""<html><head><title>Field Notes | Example Review</title></head>
+<body>
+<a href="/"><svg class="logo"/></a>
+<div class="poem">
+<h1>Field Notes</h1>
+<p class="author">by Imogen Vale</p>
+<p>The heron writes its one long sentence<br>
+across the shallows and then erases it,<br>
+patient as a teacher with the chalk.</p>
+</div>
+<svg width="12" height="12"><use href="#icon-share"/></svg>
+<footer>Example Review</footer>
+</body></html>"""),
+    ('https://example.org/poems/unterminated-script', b"""<html><head><title>Night Ferry | Example Review</title></head>
+<body>
+<div class="poem">
+<h1>Night Ferry</h1>
+<p class="author">by Tomasz Wren</p>
+<p>The deck lights swing their small lanterns<br>
+over water that will not hold them,<br>
+and the far shore keeps its own counsel.</p>
+</div>
+<script>window.dataLayer = window.dataLayer || []; var closing = "</div>";
+</body></html>"""),
+    ('https://example.org/poems/json-ld', b"""<html><head><title>Almanac | Example Review</title>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Article",
+ "headline": "Almanac", "author": {"@type": "Person", "name": "Ada Lindqvist"}}</script>
+<script>var tracker = "<div class='poem'>ad slot</div>";</script>
+<style>.poem p { margin: 0 }</style>
+</head>
+<body>
+<div class="poem">
+<p>Frost on the rain barrel, a thin lid<br>
+the sparrows test with careful feet,<br>
+the whole yard waiting on a warmer word.</p>
+</div>
+</body></html>"""),
+    ('https://example.org/poems/comments', b"""<html><head><title>Lent | Example Review</title>
+<!--[if lt IE 9]><script src="/html5shiv.js"></script><![endif]-->
+</head>
+<body>
+<!-- <div class="poem"><p>An old draft that should never be read</p></div> -->
+<div class="poem">
+<h1>Lent</h1>
+<p class="author">by Ruth Abernathy</p>
+<p>We give up the small sweet things<br>
+<!-- line break kept for the print edition -->
+and find the days have room enough<br>
+for light to sit down at the table.</p>
+</div>
+<!-- unclosed comment at the end of the page
+</body></html>""")
+]
+
+
+# Pages whose metadata disagrees with the on-page byline: (url, body, expected title, expected author)
+METADATA_PAGES = [
+    ('https://example.org/poems/og-title-with-byline', b"""<html><head>
+<meta property="og:title" content="Love in the Weather's Bells by Eavan Boland">
+<title>Love in the Weather's Bells | Example Review</title>
+</head>
+<body>
+<div class="poem">
+<p class="author">Eavan Boland</p>
+<p>Fog again, and the harbour bell<br>
+keeps its own time under the hill,<br>
+calling the boats that never answer.</p>
+</div>
+</body></html>""", "Love in the Weather's Bells", 'Eavan Boland'),
+    ('https://example.org/2024/05/a-small-hour/', b"""<html><head>
+<meta name="author" content="Timothy Green">
+<title>A Small Hour | Example Review</title>
+</head>
+<body>
+<article>
+<h1 class="entry-title">A Small Hour</h1>
+<p class="byline">by Jane Poet</p>
+<div class="entry-content">
+<p>The kettle ticks as it cools<br>
+and the cat rearranges the dark,<br>
+nothing asked of us until morning.</p>
+</div>
+</article>
+</body></html>""", 'A Small Hour', 'Jane Poet')
+]
+
+
+def load_fixture_pages():
+    """Return (url, body) for every recorded HTML page"""
+    cassette = Cassette(HTTP_SETTINGS.get('cassette_dir', 'fixtures/cassettes'))
+    pages = []
+    for entry, body in cassette.entries():
+        content_type = {k.lower(): v for k, v in entry['headers'].items()}.get('content-type', '')
+        if entry['method'] == 'GET' and entry['status'] == 200 and 'html' in content_type:
+            pages.append((entry['url'], body))
+    return pages
+
+
+def fixture_pages():
+    """Return (url, body) for the sample pages and every recorded page, skipping the test if there are none"""
+    pages = SAMPLE_PAGES + load_fixture_pages()
+    if not pages:
+        pytest.skip("No fixture pages to compare")
+    return pages
+
+
+def site_config_for(url):
+    """Find the SITE_CONFIGS entry for a URL's host, ignoring a leading 'www.'"""
+    host = urlparse(url).netloc
+    for domain, config in SITE_CONFIGS.items():
+        if host == domain or host.replace('www.', '', 1) == domain.replace('www.', '', 1):
+            return config
+    return None
+
+
+def poem_fields(poem):
+    if not poem:
+        return None
+    return (poem['title'], poem['author'], poem['text'])
+
+
+def test_poem_extraction_matches_across_backends():
+    """Titles, authors and poem text must be identical with every backend"""
+    mismatches = []
+    for url, body in fixture_pages():
+        results = {backend: poem_fields(extract_poem_from_html(body, url, parser=backend)) for backend in BACKENDS}
+        if len(set(results.values())) > 1:
+            mismatches.append((url, results))
+            print(f"❌ Extraction differs for {url}")
+            for backend, fields in results.items():
+                print(f"   {backend}: {fields}")
+        else:
+            print(f"✅ Extraction identical for {url}")
+    assert not mismatches, f"{len(mismatches)} fixture page(s) extract differently across backends"
+
+
+def test_link_discovery_matches_across_backends():
+    """Discovered poem links must be identical with every backend"""
+    mismatches = []
+    checked = 0
+    for url, body in fixture_pages():
+        config = site_config_for(url)
+        if not config:
+            continue
+        checked += 1
+        results = {backend: tuple(extract_poem_links(body, url, config, parser=backend)) for backend in BACKENDS}
+        if len(set(results.values())) > 1:
+            mismatches.append(url)
+            print(f"❌ Discovered links differ for {url}")
+        else:
+            print(f"✅ Discovered links identical for {url} ({len(results[BACKENDS[0]])} links)")
+    if not checked:
+        pytest.skip("No fixture page belongs to a configured site")
+    assert not mismatches, f"{len(mismatches)} fixture page(s) discover different links across backends"
+
+
+def test_block_stripping_preserves_extraction():
+    """Poem fields and discovered links must not change when unused blocks are stripped"""
+    mismatches = []
+    original = PARSER_SETTINGS.get('strip_unused_blocks', True)
+    try:
+        for url, body in fixture_pages() + STRIPPING_EDGE_PAGES:
+            config = site_config_for(url)
+            results = {}
+            for strip in (False, True):
+                PARSER_SETTINGS['strip_unused_blocks'] = strip
+                links = tuple(extract_poem_links(body, url, config)) if config else None
+                results[strip] = (poem_fields(extract_poem_from_html(body, url)), links)
+            if results[False] != results[True]:
+                mismatches.append(url)
+                print(f"❌ Stripping unused blocks changes results for {url}")
+            else:
+                print(f"✅ Stripping unused blocks keeps results for {url}")
+    finally:
+        PARSER_SETTINGS['strip_unused_blocks'] = original
+    assert not mismatches, f"{len(mismatches)} fixture page(s) change when unused blocks are stripped"
+
+
+def test_self_closing_svg_keeps_following_content():
+    """A self-closing <svg/> must not swallow the page up to the next </svg>"""
+    markup = (b'<a href="/"><svg class="logo"/></a><div class="poem"><p>line one</p></div>'
+              b'<svg><use/></svg><footer>')
+    expected = b'<a href="/"><svg class="logo"/></a><div class="poem"><p>line one</p></div><footer>'
+    assert strip_unused_blocks(markup) == expected
+    assert strip_unused_blocks(markup.decode()) == expected.decode()
+
+
+
+def test_page_byline_settles_metadata_fields():
+    """An on-page byline wins over <meta name="author"> and trims 'by <author>' from a metadata title"""
+    mismatches = []
+    for url, body, title, author in METADATA_PAGES:
+        poem = extract_poem_from_html(body, url)
+        fields = poem and (poem['title'], poem['author'])
+        if fields != (title, author):
+            mismatches.append(url)
+            print(f"❌ Expected {(title, author)} from {url}, got {fields}")
+        else:
+            print(f"✅ Title and author settled for {url}")
+    assert not mismatches, f"{len(mismatches)} page(s) extract the wrong title or author"
+
+
+if __name__ == "__main__":
+    PARSER_SETTINGS['selector_profiles'] = False
+    pages = load_fixture_pages()
+    print(f"🧪 Comparing parser backends on {len(SAMPLE_PAGES)} sample and {len(pages)} recorded pages")
+    print("=" * 60)
+    if not pages:
+        print("⚠️  No fixtures recorded yet - only the sample pages are checked")
+    test_poem_extraction_matches_across_backends()
+    test_link_discovery_matches_across_backends()
+    test_block_stripping_preserves_extraction()
+    test_self_closing_svg_keeps_following_content()
+    test_page_byline_settles_metadata_fields()
+    print("\n🎉 All backends produce identical results")
@@ -6,8 +6,8 @@ Test poem extraction from different literary journals
 from poetry_bot import PoetryBot
 from config import get_weighted_journal_list
 import random
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parsing import make_soup
 import sys
 
 def test_poem_sources():
@@ -67,14 +67,13 @@ def test_poem_extraction(url, source_name):
     print(f"📍 URL: {url}")
     
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code != 200:
             print(f"❌ HTTP {response.status_code}")
             return None
             
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
         
         # For Poetry Daily - get today's featured poem
         if 'poems.com' in url:
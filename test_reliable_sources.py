@@ -3,8 +3,8 @@
 Test script for reliable poetry sources with known good poem URLs
 """
 
-import requests
-from bs4 import BeautifulSoup
+from http_client import http_get
+from html_parsing import make_soup
 import re
 from urllib.parse import urljoin, urlparse
 
@@ -20,18 +20,16 @@ def test_poetry_foundation_specific_poems():
         'https://www.poetryfoundation.org/poems/42749/love-in-the-weathers-bells'
     ]
     
-    headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-    
     for url in test_urls:
         print(f"\n🔍 Testing: {url}")
         
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, timeout=15)
             if response.status_code != 200:
                 print(f"❌ HTTP {response.status_code}")
                 continue
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Extract title
             title = "Untitled"
@@ -156,18 +154,16 @@ def test_poems_com_specific():
         'https://poems.com/poem/in-reverse/'
     ]
     
-    headers = {'User-Agent': 'Mozilla/5.0 (compatible; PoetryBot/1.0)'}
-    
     for url in test_urls:
         print(f"\n🔍 Testing Poetry Daily: {url}")
         
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, timeout=15)
             if response.status_code != 200:
                 print(f"❌ HTTP {response.status_code}")
                 continue
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Extract title from URL or page
             title = url.split('/')[-2].replace('-', ' ').title()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Precompiled URL classification for poem link discovery
+Each site's poem_patterns and exclude_patterns are combined into one
+alternation apiece, so classifying a link costs two regex calls no matter how
+many patterns a site configures
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+
+POEM = 'poem'
+EXCLUDED = 'excluded'
+OTHER = 'other'
+
+
+def _combine(patterns: Iterable[str]) -> Optional[Pattern]:
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+class UrlClassifier:
+    """Compiled poem/exclude matchers for one site configuration"""
+
+    def __init__(self, poem_patterns: Iterable[str], exclude_patterns: Iterable[str]):
+        # poem_patterns are anchored at the start of the path (re.match),
+        # exclude_patterns may match anywhere in it (re.search)
+        self.poem_matcher = _combine(poem_patterns)
+        self.exclude_matcher = _combine(exclude_patterns)
+
+    def classify_path(self, path: str) -> str:
+        """
+        Classify a URL path
+
+        Args:
+            path: Path component of a URL
+
+        Returns:
+            'excluded' if an exclude pattern matches, otherwise 'poem' if a poem
+            pattern matches, otherwise 'other'
+        """
+        if self.exclude_matcher is not None and self.exclude_matcher.search(path):
+            return EXCLUDED
+        if self.poem_matcher is not None and self.poem_matcher.match(path):
+            return POEM
+        return OTHER
+
+    def classify(self, url: str) -> str:
+        """
+        Classify a URL by its path
+
+        Args:
+            url: Absolute or relative URL
+
+        Returns:
+            'poem', 'excluded' or 'other'
+        """
+        return self.classify_path(urlparse(url).path)
+
+
+@lru_cache(maxsize=None)
+def _compiled(poem_patterns: Tuple[str, ...], exclude_patterns: Tuple[str, ...]) -> UrlClassifier:
+    return UrlClassifier(poem_patterns, exclude_patterns)
+
+
+def classifier_for(site_config: Dict) -> UrlClassifier:
+    """
+    Return the compiled classifier for a site configuration
+
+    Classifiers are cached by their patterns, so configurations built at
+    runtime are compiled once as well.
+
+    Args:
+        site_config: Configuration dict with poem_patterns / exclude_patterns
+
+    Returns:
+        The site's UrlClassifier
+    """
+    return _compiled(tuple(site_config.get('poem_patterns', ())), tuple(site_config.get('exclude_patterns', ())))